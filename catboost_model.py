@@ -1,34 +1,87 @@
 #!/usr/bin/env python3
 """
 CatBoost-based ML model for effort expense prediction
+
+CatBoost is given an explicit thread count equal to the CPUs available to
+this process, since its own default often leaves cores idle on many-core
+and multi-socket hosts. On NUMA machines, launch the app under
+``numactl --interleave=all`` so the training threads aren't confined to one
+node's memory.
 """
 
 import pandas as pd
 import numpy as np
 import logging
 import os
-from typing import Dict, Any, List
-from catboost import CatBoostRegressor
-from sklearn.model_selection import train_test_split, GridSearchCV
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+from catboost import CatBoostRegressor, CatBoostError, Pool
+from catboost.utils import get_gpu_device_count
+from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 from sklearn.preprocessing import StandardScaler
 import joblib
+from joblib import Parallel, delayed
+from config import EFFORT_EXPENSE_LIMIT
 
 logger = logging.getLogger(__name__)
 
+def _available_cpu_count() -> int:
+    """Number of CPUs this process may run on (respects affinity/cgroup pinning)."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+@lru_cache(maxsize=1)
+def _gpu_available() -> bool:
+    """Check (once per process) whether CatBoost can use a CUDA device."""
+    try:
+        return get_gpu_device_count() > 0
+    except CatBoostError:
+        return False
+
+def _postprocess_predictions(predictions: np.ndarray, is_over_limit: np.ndarray,
+                             effort_limit: float):
+    """Clip raw predictions and derive the final effort values in one pass.
+
+    Predictions are capped to [0, effort_limit] (30 hours max) in place. Missing
+    values take the capped prediction as final; over-limit values are capped at
+    the limit itself.
+    """
+    predicted = np.clip(predictions, 0, effort_limit, out=predictions)
+    final = np.where(is_over_limit, effort_limit, predicted)
+    return predicted, final
+
 class CatBoostEffortModel:
     """CatBoost model for effort expense prediction."""
+
+    CATEGORICAL_COLUMNS = [
+        'msg_JobTitle', 'msg_Community', 'taskType',
+        'CountryManagerForProject', 'Email'
+    ]
+    CONTINUOUS_COLUMNS = ['effortTimeCosts', 'billingRate_hourlyRate']
+    DATE_PART_COLUMNS = ['year', 'month', 'day', 'dayofweek', 'weekofyear']
+    NUMERICAL_COLUMNS = CONTINUOUS_COLUMNS + DATE_PART_COLUMNS
     
-    def __init__(self, effort_limit: float = 30.0):
+    def __init__(self, effort_limit: float = EFFORT_EXPENSE_LIMIT):
         """Initialize the CatBoost model."""
         self.effort_limit = effort_limit
         self.model = None
-        self.scaler = StandardScaler()
+        # Trees are invariant to monotonic rescaling, so numerical features are
+        # fed to CatBoost as-is; scaling is only kept for models that need it
+        self.scale_numerical = False
+        self.scaler = None
         self.feature_columns = []
         self.categorical_columns = []
         self.target_column = 'effortExpense'
         self.is_trained = False
         self.model_metrics = {}
+        self._num_medians = {}
+        self._cat_categories = {}
+        self._cat_codes = False
+        self._feature_importance = {}
+        self._mean = None
+        self._scale = None
         
         # CatBoost parameters optimized for fast training
         self.catboost_params = {
@@ -42,62 +95,197 @@ class CatBoostEffortModel:
             'early_stopping_rounds': 20,  # Reduced for faster training
             'l2_leaf_reg': 1,  # Reduced regularization
             'bootstrap_type': 'Bernoulli',  # Simple and fast
-            'thread_count': -1,  # Use all available cores
-            'task_type': 'CPU'  # Explicitly use CPU
+            'thread_count': _available_cpu_count(),  # Use all available cores
+            'task_type': 'CPU'  # Switched to GPU below when one is available
         }
+        
+        # Train on the GPU when CatBoost can see a CUDA device
+        self._use_gpu = _gpu_available()
+        if self._use_gpu:
+            self.catboost_params.update({'task_type': 'GPU', 'devices': '0'})
+            logger.info("CUDA device found - CatBoost will train on GPU")
+        logger.info(f"CatBoost thread count: {self.catboost_params['thread_count']}")
     
     def prepare_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Prepare features for CatBoost model training."""
-        df_processed = df.copy()
-        
-        # Extract time-based features from effortDate
-        if 'effortDate' in df_processed.columns:
-            df_processed['effortDate'] = pd.to_datetime(df_processed['effortDate'])
-            df_processed['year'] = df_processed['effortDate'].dt.year
-            df_processed['month'] = df_processed['effortDate'].dt.month
-            df_processed['day'] = df_processed['effortDate'].dt.day
-            df_processed['dayofweek'] = df_processed['effortDate'].dt.dayofweek
-            df_processed['weekofyear'] = df_processed['effortDate'].dt.isocalendar().week
-        
+        """Prepare features for the CatBoost model.
+
+        The feature schema (medians, category levels) is learned from ``df``
+        only while the model is untrained; afterwards the training-time schema
+        is reused so repeated calls don't recompute it.
+        """
+        if not self.is_trained:
+            self._fit_feature_schema(df)
+        return self._transform_features(df)
+
+    def _extract_numerical_features(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
+        """Coerce numerical columns and derive date parts from effortDate."""
+        numerical = {}
+        for col in self.CONTINUOUS_COLUMNS:
+            if col in df.columns:
+                numerical[col] = pd.to_numeric(df[col], errors='coerce')
+
+        # Extract time-based features from effortDate with a single datetime64
+        # decomposition instead of one .dt accessor pass per feature
+        if 'effortDate' in df.columns:
+            dates = pd.to_datetime(df['effortDate']).to_numpy(dtype='datetime64[D]')
+            is_nat = np.isnat(dates)
+            days = dates.astype(np.int64)
+            month_start = dates.astype('datetime64[M]')
+            dayofweek = (days + 3) % 7  # 1970-01-01 was a Thursday
+            # ISO week: the week's Thursday decides both the ISO year and week
+            thursday = dates - dayofweek + 3
+            iso_year_start = thursday.astype('datetime64[Y]').astype('datetime64[D]')
+            date_parts = {
+                'year': dates.astype('datetime64[Y]').astype(np.int64) + 1970,
+                'month': month_start.astype(np.int64) % 12 + 1,
+                'day': (dates - month_start.astype('datetime64[D]')).astype(np.int64) + 1,
+                'dayofweek': dayofweek,
+                'weekofyear': (thursday - iso_year_start).astype(np.int64) // 7 + 1
+            }
+            has_nat = is_nat.any()
+            for col, values in date_parts.items():
+                if has_nat:
+                    values = np.where(is_nat, np.nan, values)
+                numerical[col] = pd.Series(values, index=df.index)
+
+        return numerical
+
+    def _fit_feature_schema(self, df: pd.DataFrame) -> None:
+        """Learn feature columns, imputation medians and category levels."""
+        numerical = self._extract_numerical_features(df)
+
         # Define categorical columns
-        self.categorical_columns = [
-            'msg_JobTitle', 'msg_Community', 'taskType', 
-            'CountryManagerForProject', 'Email'
-        ]
-        
-        # Define numerical columns
-        numerical_columns = [
-            'effortTimeCosts', 'billingRate_hourlyRate',
-            'year', 'month', 'day', 'dayofweek', 'weekofyear'
-        ]
-        
+        self.categorical_columns = list(self.CATEGORICAL_COLUMNS)
+
         # Combine all feature columns
-        self.feature_columns = [col for col in numerical_columns + self.categorical_columns 
-                              if col in df_processed.columns]
-        
-        # Handle missing values in numerical features
-        for col in numerical_columns:
-            if col in df_processed.columns:
-                df_processed[col] = pd.to_numeric(df_processed[col], errors='coerce')
-                df_processed[col] = df_processed[col].fillna(df_processed[col].median())
-        
-        # Handle missing values in categorical features
+        self.feature_columns = [col for col in self.NUMERICAL_COLUMNS if col in numerical] + \
+                               [col for col in self.categorical_columns if col in df.columns]
+
+        self._num_medians = {col: float(values.median()) for col, values in numerical.items()}
+        self._cat_codes = True
+        self._cat_categories = {}
         for col in self.categorical_columns:
-            if col in df_processed.columns:
-                df_processed[col] = df_processed[col].fillna('Unknown')
-        
+            if col in df.columns:
+                categories = pd.Index(df[col].dropna().unique())
+                if 'Unknown' not in categories:
+                    categories = categories.append(pd.Index(['Unknown']))
+                self._cat_categories[col] = categories.tolist()
+
         logger.info(f"Prepared {len(self.feature_columns)} features for training")
-        logger.info(f"Categorical features: {[col for col in self.categorical_columns if col in df_processed.columns]}")
-        
+        logger.info(f"Categorical features: {[col for col in self.categorical_columns if col in df.columns]}")
+
+    def _transform_features(self, df: pd.DataFrame,
+                            fallback_medians: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+        """Apply the learned feature schema to a frame.
+
+        Returns a new frame holding only the model features (and the target,
+        when present) instead of a full copy of the input. ``fallback_medians``
+        stand in for training-time medians that the model doesn't have.
+        """
+        columns = {}
+
+        if logger.isEnabledFor(logging.DEBUG):
+            memory_before = df.memory_usage(deep=True).sum() / 1e6
+
+        # Handle missing values in numerical features with the training-time
+        # medians and downcast to the smallest dtype that holds them
+        # (CatBoost works on float32 internally)
+        for col, values in self._extract_numerical_features(df).items():
+            median = self._num_medians.get(col)
+            if median is None:
+                # Models saved before medians were persisted
+                median = (fallback_medians or {}).get(col)
+            if median is None:
+                median = values.median()
+            downcast = 'float' if col in self.CONTINUOUS_COLUMNS else 'integer'
+            columns[col] = pd.to_numeric(values.fillna(median), downcast=downcast)
+
+        # Handle missing values in categorical features; levels unseen during
+        # training fall back to 'Unknown'. Levels are passed to CatBoost as
+        # the integer codes fixed at training time so the strings aren't
+        # re-hashed on every fit/predict.
+        for col in self.categorical_columns:
+            if col in df.columns:
+                categories = self._cat_categories.get(col)
+                if categories is None:
+                    values = df[col]
+                    if isinstance(values.dtype, pd.CategoricalDtype) and 'Unknown' not in values.cat.categories:
+                        values = values.cat.add_categories('Unknown')
+                    columns[col] = values.fillna('Unknown').astype('category')
+                elif not self._cat_codes:
+                    # Models trained on the category labels themselves
+                    columns[col] = pd.Categorical(
+                        df[col], categories=categories
+                    ).fillna('Unknown')
+                else:
+                    codes = pd.Categorical(df[col], categories=categories).codes
+                    unknown_code = categories.index('Unknown')
+                    # Wrapped as a categorical of the codes themselves: CatBoost
+                    # reads the values the same way as plain ints, but builds
+                    # the Pool from the category index instead of stringifying
+                    # every row
+                    columns[col] = pd.Categorical.from_codes(
+                        np.where(codes < 0, unknown_code, codes),
+                        categories=pd.RangeIndex(len(categories))
+                    )
+
+        if self.target_column in df.columns:
+            columns[self.target_column] = df[self.target_column]
+
+        df_processed = pd.DataFrame(columns, index=df.index)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            memory_after = df_processed.memory_usage(deep=True).sum() / 1e6
+            logger.debug(f"Feature frame memory: {memory_before:.2f} MB -> {memory_after:.2f} MB")
+
         return df_processed
     
+    def _run_with_cpu_fallback(self, train_fn):
+        """Run a CatBoost training step, retrying on CPU if the GPU run fails."""
+        try:
+            return train_fn()
+        except CatBoostError as e:
+            if not self._use_gpu:
+                raise
+            logger.warning(f"GPU training failed ({str(e)}), falling back to CPU")
+            self._use_gpu = False
+            self.catboost_params['task_type'] = 'CPU'
+            self.catboost_params.pop('devices', None)
+            return train_fn()
+
+    def _predict(self, data) -> np.ndarray:
+        """Predict with the trained model on the device it was trained for."""
+        # Starting worker threads costs more than scoring a single row
+        n_rows = data.num_row() if isinstance(data, Pool) else len(data)
+        thread_count = 1 if n_rows == 1 else -1
+        # CatBoost predicts on CPU unless the device is requested explicitly
+        if self._use_gpu:
+            try:
+                return self.model.predict(data, thread_count=thread_count, task_type='GPU')
+            except CatBoostError as e:
+                logger.warning(f"GPU prediction failed ({str(e)}), predicting on CPU")
+        return self.model.predict(data, thread_count=thread_count)
+
+    def _set_scaling_stats(self) -> None:
+        """Cache the fitted scaler statistics as float32 arrays."""
+        if hasattr(self.scaler, 'mean_'):
+            self._mean = self.scaler.mean_.astype(np.float32)
+            self._scale = self.scaler.scale_.astype(np.float32)
+
+    def _scale_inplace(self, arr: np.ndarray) -> np.ndarray:
+        """Standardize a float32 array in place and return it."""
+        np.subtract(arr, self._mean, out=arr)
+        np.divide(arr, self._scale, out=arr)
+        return arr
+
     def train_model(self, df: pd.DataFrame, test_size: float = 0.2, 
                    hyperparameter_tuning: bool = True, fast_mode: bool = True) -> Dict[str, Any]:
         """Train the CatBoost model on the provided data."""
         logger.info("Starting CatBoost model training...")
         
-        # Prepare features
-        df_processed = self.prepare_features(df)
+        # Prepare features, (re)learning the schema from the training frame
+        self._fit_feature_schema(df)
+        df_processed = self._transform_features(df)
         
         # Remove rows with missing target values for training
         train_data = df_processed.dropna(subset=[self.target_column])
@@ -106,74 +294,77 @@ class CatBoostEffortModel:
             raise ValueError("Not enough training data. Need at least 10 rows with effort expense values.")
         
         # Prepare features and target
-        X = train_data[self.feature_columns].copy()
-        y = train_data[self.target_column].copy()
+        X = train_data[self.feature_columns]
         
         # Add constraints to target variable to improve accuracy
         # Cap extreme values at the effort limit (30 hours max)
-        y_capped = y.copy()
-        y_capped = y_capped.clip(upper=self.effort_limit)  # Cap at 30 hours max
+        y_arr = np.minimum(train_data[self.target_column].to_numpy(dtype=np.float32), self.effort_limit)
         
         # Remove outliers that might confuse the model
-        Q1 = y_capped.quantile(0.25)
-        Q3 = y_capped.quantile(0.75)
+        Q1, Q3 = np.quantile(y_arr, [0.25, 0.75])
         IQR = Q3 - Q1
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
         
         # Keep only reasonable values
-        outlier_mask = (y_capped >= lower_bound) & (y_capped <= upper_bound)
+        outlier_mask = (y_arr >= Q1 - 1.5 * IQR) & (y_arr <= Q3 + 1.5 * IQR)
         X = X[outlier_mask]
-        y_capped = y_capped[outlier_mask]
+        y_arr = y_arr[outlier_mask]
+        y_capped = pd.Series(y_arr, index=X.index)
         
         logger.info(f"Training data: {len(X)} rows after outlier removal")
-        logger.info(f"Target range: {y_capped.min():.2f} - {y_capped.max():.2f} hours")
+        logger.info(f"Target range: {y_arr.min():.2f} - {y_arr.max():.2f} hours")
         
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(
             X, y_capped, test_size=test_size, random_state=42
         )
         
-        # Scale numerical features (CatBoost handles categorical automatically)
+        # Scale numerical features if enabled (CatBoost handles categorical automatically)
         numerical_features = [col for col in self.feature_columns 
                             if col not in self.categorical_columns]
         
-        if numerical_features:
+        if self.scale_numerical and numerical_features:
             X_train_scaled = X_train.copy()
             X_test_scaled = X_test.copy()
             
-            # Scale numerical features
-            X_train_scaled[numerical_features] = self.scaler.fit_transform(X_train[numerical_features])
-            X_test_scaled[numerical_features] = self.scaler.transform(X_test[numerical_features])
+            # Scale numerical features with the fitted float32 mean/std
+            self.scaler = StandardScaler().fit(X_train[numerical_features])
+            self._set_scaling_stats()
+            X_train_scaled[numerical_features] = self._scale_inplace(
+                X_train[numerical_features].to_numpy(dtype=np.float32, copy=True))
+            X_test_scaled[numerical_features] = self._scale_inplace(
+                X_test[numerical_features].to_numpy(dtype=np.float32, copy=True))
         else:
-            X_train_scaled = X_train.copy()
-            X_test_scaled = X_test.copy()
+            X_train_scaled = X_train
+            X_test_scaled = X_test
+        
+        # Get categorical feature indices for CatBoost
+        cat_features = [i for i, col in enumerate(self.feature_columns) 
+                       if col in self.categorical_columns]
+        
+        # Convert the splits to CatBoost's internal format once and reuse the
+        # pools for tuning, fitting and scoring
+        train_pool = Pool(X_train_scaled, y_train, cat_features=cat_features)
+        eval_pool = Pool(X_test_scaled, y_test, cat_features=cat_features)
         
         # Hyperparameter tuning (skip if fast mode)
         if hyperparameter_tuning and not fast_mode:
-            best_params = self._hyperparameter_tuning(X_train_scaled, y_train)
+            best_params = self._run_with_cpu_fallback(
+                lambda: self._hyperparameter_tuning(train_pool))
             self.catboost_params.update(best_params)
         elif fast_mode:
             logger.info("Fast mode enabled - skipping hyperparameter tuning for speed")
         
         # Train CatBoost model
-        self.model = CatBoostRegressor(**self.catboost_params)
-        
-        # Get categorical feature indices for CatBoost
-        cat_features = [i for i, col in enumerate(self.feature_columns) 
-                       if col in self.categorical_columns]
+        def fit_model():
+            self.model = CatBoostRegressor(**self.catboost_params)
+            self.model.fit(train_pool, eval_set=eval_pool, use_best_model=True)
         
-        # Train the model
-        self.model.fit(
-            X_train_scaled, y_train,
-            cat_features=cat_features,
-            eval_set=(X_test_scaled, y_test),
-            use_best_model=True
-        )
+        self._run_with_cpu_fallback(fit_model)
+        self._feature_importance = {}
         
         # Make predictions
-        y_pred_train = self.model.predict(X_train_scaled)
-        y_pred_test = self.model.predict(X_test_scaled)
+        y_pred_train = self._predict(train_pool)
+        y_pred_test = self._predict(eval_pool)
         
         # Calculate metrics
         self.model_metrics = {
@@ -196,7 +387,7 @@ class CatBoostEffortModel:
         
         return self.model_metrics
     
-    def _hyperparameter_tuning(self, X_train: np.ndarray, y_train: np.ndarray) -> Dict[str, Any]:
+    def _hyperparameter_tuning(self, train_pool: Pool) -> Dict[str, Any]:
         """Perform fast hyperparameter tuning using a smaller grid."""
         logger.info("Performing fast hyperparameter tuning...")
         
@@ -213,155 +404,234 @@ class CatBoostEffortModel:
         model = CatBoostRegressor(**{k: v for k, v in self.catboost_params.items() 
                                    if k not in param_grid})
         
-        # Get categorical feature indices
-        cat_features = [i for i, col in enumerate(self.feature_columns) 
-                       if col in self.categorical_columns]
-        
-        # Use fewer CV folds for faster tuning
-        grid_search = GridSearchCV(
-            model, param_grid, cv=2, scoring='neg_mean_squared_error', 
-            n_jobs=-1, verbose=0
+        # CatBoost's native grid search reuses the training Pool for every
+        # candidate; use fewer CV folds and skip the refit for faster tuning
+        result = model.grid_search(
+            param_grid, train_pool, cv=2, partition_random_seed=42,
+            refit=False, verbose=False
         )
         
-        grid_search.fit(X_train, y_train, cat_features=cat_features)
+        best_params = result['params']
+        # CatBoost reports early_stopping_rounds under its od_wait alias
+        if 'od_wait' in best_params:
+            best_params['early_stopping_rounds'] = best_params.pop('od_wait')
         
-        logger.info(f"Best parameters: {grid_search.best_params_}")
-        return grid_search.best_params_
+        logger.info(f"Best parameters: {best_params}")
+        return best_params
     
     def _get_feature_importance(self) -> Dict[str, float]:
-        """Get feature importance from the trained model."""
+        """Get feature importance from the trained model.
+
+        Computed once per trained model and cached; values are plain floats so
+        the metrics stay JSON-serializable for the model database.
+        """
         if self.model is None:
             return {}
         
-        importance = self.model.get_feature_importance()
-        feature_names = self.feature_columns
+        if not self._feature_importance:
+            importance = self.model.get_feature_importance()
+            self._feature_importance = dict(zip(self.feature_columns, importance.tolist()))
         
-        return dict(zip(feature_names, importance))
+        return self._feature_importance
     
-    def predict(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Make predictions for missing and over-limit effort expenses."""
+    def _issue_masks(self, df: pd.DataFrame):
+        """Return the target as float64 plus its missing and over-limit masks."""
+        target_arr = df[self.target_column].to_numpy(dtype=np.float64, na_value=np.nan)
+        return target_arr, np.isnan(target_arr), target_arr > self.effort_limit
+    
+    def prediction_pool(self, df: pd.DataFrame) -> Optional[Pool]:
+        """Build the feature Pool for the rows of df that need prediction.
+
+        Returns None when no row needs prediction. The Pool can be passed back
+        to predict() for the same frame to skip feature conversion.
+        """
+        _, is_missing, is_over_limit = self._issue_masks(df)
+        needs = is_missing | is_over_limit
+        if not needs.any():
+            return None
+        
+        # Prepare features only for the rows being predicted. Model features are
+        # kept separate from the returned frame so that the imputed/downcast
+        # feature dtypes don't leak into downstream reports. Models saved
+        # without training-time medians impute from whole-frame medians, which
+        # only need the numerical columns of the other rows.
+        fallback_medians = None
+        if not self._num_medians:
+            fallback_medians = {col: values.median()
+                                for col, values in self._extract_numerical_features(df).items()}
+        X = self._transform_features(df.loc[needs], fallback_medians)[self.feature_columns]
+        
+        # Handle numerical features
+        numerical_features = [col for col in self.feature_columns 
+                            if col not in self.categorical_columns]
+        
+        if self.scale_numerical and numerical_features:
+            # Scale numerical features
+            X_scaled = X.copy()
+            X_scaled[numerical_features] = self._scale_inplace(
+                X[numerical_features].to_numpy(dtype=np.float32, copy=True))
+        else:
+            X_scaled = X
+        
+        cat_features = [i for i, col in enumerate(self.feature_columns) 
+                       if col in self.categorical_columns]
+        return Pool(X_scaled, cat_features=cat_features)
+    
+    def predict(self, df: pd.DataFrame, pool: Optional[Pool] = None) -> pd.DataFrame:
+        """Make predictions for missing and over-limit effort expenses.
+
+        Only reads the trained model and feature schema, so a trained instance
+        can be shared between concurrent callers. ``pool`` is an optional
+        prediction_pool() built earlier from this same frame.
+        """
         logger.info("Making predictions with CatBoost model...")
         
-        df_processed = self.prepare_features(df)
+        target = df[self.target_column]
         
         # Identify missing and over-limit values first
-        df_processed['is_missing_effort'] = df_processed[self.target_column].isna()
-        df_processed['is_over_limit'] = df_processed[self.target_column] > self.effort_limit
-        df_processed['needs_prediction'] = df_processed['is_missing_effort'] | df_processed['is_over_limit']
-        
-        # Initialize prediction columns with original values
-        df_processed['effortExpense_predicted'] = df_processed[self.target_column].copy()
-        df_processed['effortExpense_final'] = df_processed[self.target_column].copy()
-        
-        # Only predict for rows that need prediction
-        if df_processed['needs_prediction'].any():
-            # Get rows that need prediction
-            prediction_rows = df_processed[df_processed['needs_prediction']].copy()
-            
-            # Prepare features for prediction
-            X = prediction_rows[self.feature_columns].copy()
-            
-            # Handle numerical features
-            numerical_features = [col for col in self.feature_columns 
-                                if col not in self.categorical_columns]
-            
-            if numerical_features:
-                # Scale numerical features
-                X_scaled = X.copy()
-                X_scaled[numerical_features] = self.scaler.transform(X[numerical_features])
-            else:
-                X_scaled = X.copy()
-            
-            # Make predictions
-            predictions = self.model.predict(X_scaled)
-            
-            # Post-process predictions to ensure they NEVER exceed the effort limit
-            # Cap predictions at the effort limit (30 hours max)
-            predictions = np.clip(predictions, 0, self.effort_limit)
-            
-            # Apply predictions only to rows that need prediction
-            for i, (idx, row) in enumerate(prediction_rows.iterrows()):
-                predicted_value = predictions[i]
-                
-                if row['is_missing_effort']:
-                    # For missing values, use the predicted value but NEVER exceed effort limit
-                    capped_prediction = min(predicted_value, self.effort_limit)
-                    df_processed.at[idx, 'effortExpense_predicted'] = capped_prediction
-                    df_processed.at[idx, 'effortExpense_final'] = capped_prediction
-                elif row['is_over_limit']:
-                    # For over-limit values, cap at the limit (30 hours max)
-                    df_processed.at[idx, 'effortExpense_predicted'] = min(predicted_value, self.effort_limit)
-                    df_processed.at[idx, 'effortExpense_final'] = self.effort_limit
-        
-        logger.info(f"Predictions completed for {len(df_processed)} rows")
-        logger.info(f"Missing values: {df_processed['is_missing_effort'].sum()}")
-        logger.info(f"Over-limit values: {df_processed['is_over_limit'].sum()}")
-        logger.info(f"Rows needing prediction: {df_processed['needs_prediction'].sum()}")
+        target_arr, is_missing, is_over_limit = self._issue_masks(df)
+        needs = is_missing | is_over_limit
+        
+        # Nothing to predict: skip feature preparation and inference entirely
+        if not needs.any():
+            logger.info(f"No rows need prediction ({len(df)} rows checked)")
+            return df.assign(
+                is_missing_effort=is_missing,
+                is_over_limit=is_over_limit,
+                needs_prediction=needs,
+                effortExpense_predicted=target.copy(),
+                effortExpense_final=target.copy()
+            )
+        
+        # Initialize prediction arrays with original values
+        predicted_arr = target_arr.copy()
+        final_arr = target_arr.copy()
+        
+        pred_idx = df.index[needs]
+        if pool is None:
+            pool = self.prediction_pool(df)
+        
+        # Make predictions
+        predictions = self._predict(pool)
+        
+        # Post-process predictions to ensure they NEVER exceed the effort limit
+        predicted, final = _postprocess_predictions(
+            predictions, is_over_limit[needs], self.effort_limit
+        )
+        
+        # Apply predictions only to rows that need prediction
+        predicted_arr[needs] = predicted
+        final_arr[needs] = final
+        
+        logger.info(f"Predictions completed for {len(df)} rows")
+        logger.info(f"Missing values: {int(is_missing.sum())}")
+        logger.info(f"Over-limit values: {int(is_over_limit.sum())}")
+        logger.info(f"Rows needing prediction: {int(needs.sum())}")
         
         # Debug: Show which rows were actually predicted
-        predicted_rows = df_processed[df_processed['needs_prediction']]
-        if len(predicted_rows) > 0:
-            logger.info("Rows that were predicted:")
-            for idx, row in predicted_rows.iterrows():
-                original = row[self.target_column]
-                predicted = row['effortExpense_predicted']
-                final = row['effortExpense_final']
-                issue_type = "missing" if row['is_missing_effort'] else "over_limit"
-                logger.info(f"  Row {idx}: {issue_type} - Original: {original}, Predicted: {predicted:.2f}, Final: {final:.2f}")
-            
-            # Validate predictions NEVER exceed effort limit
-            high_predictions = predicted_rows[predicted_rows['effortExpense_predicted'] > self.effort_limit]
-            if len(high_predictions) > 0:
-                logger.error(f"❌ ERROR: {len(high_predictions)} predictions exceed {self.effort_limit} hours - this should never happen!")
-                # Force cap these predictions
-                for idx in high_predictions.index:
-                    df_processed.at[idx, 'effortExpense_predicted'] = self.effort_limit
-                    df_processed.at[idx, 'effortExpense_final'] = self.effort_limit
-                logger.info(f"✅ Fixed: Capped {len(high_predictions)} predictions to {self.effort_limit} hours")
+        predicted_values = predicted_arr[needs]
+        logger.info(f"Predicted values: min={predicted_values.min():.2f}, "
+                    f"max={predicted_values.max():.2f}, mean={predicted_values.mean():.2f}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Rows that were predicted:\n%s", pd.DataFrame({
+                self.target_column: target_arr[needs],
+                'effortExpense_predicted': predicted_values,
+                'effortExpense_final': final_arr[needs]
+            }, index=pred_idx).to_string())
+        
+        # Validate predictions NEVER exceed effort limit
+        high_predictions = needs & (predicted_arr > self.effort_limit)
+        if high_predictions.any():
+            logger.error(f"❌ ERROR: {int(high_predictions.sum())} predictions exceed {self.effort_limit} hours - this should never happen!")
+            # Force cap these predictions
+            predicted_arr[high_predictions] = self.effort_limit
+            final_arr[high_predictions] = self.effort_limit
+            logger.info(f"✅ Fixed: Capped {int(high_predictions.sum())} predictions to {self.effort_limit} hours")
         
         # Final validation: Ensure NO values exceed effort limit
-        final_high_values = df_processed[df_processed['effortExpense_final'] > self.effort_limit]
-        if len(final_high_values) > 0:
-            logger.error(f"❌ CRITICAL ERROR: {len(final_high_values)} final values exceed {self.effort_limit} hours!")
+        final_high_values = final_arr > self.effort_limit
+        if final_high_values.any():
+            logger.error(f"❌ CRITICAL ERROR: {int(final_high_values.sum())} final values exceed {self.effort_limit} hours!")
             # Force cap ALL final values
-            df_processed['effortExpense_final'] = df_processed['effortExpense_final'].clip(upper=self.effort_limit)
+            np.minimum(final_arr, self.effort_limit, out=final_arr)
             logger.info(f"✅ EMERGENCY FIX: Capped ALL final values to {self.effort_limit} hours")
         
+        # Attach the masks and results to the returned frame in one assign
+        df_processed = df.assign(
+            is_missing_effort=is_missing,
+            is_over_limit=is_over_limit,
+            needs_prediction=needs,
+            effortExpense_predicted=predicted_arr,
+            effortExpense_final=final_arr
+        )
+        
         return df_processed
     
+    @staticmethod
+    def native_model_path(filepath: str) -> str:
+        """Path of the native CatBoost file stored next to a model file."""
+        return os.path.splitext(filepath)[0] + '.cbm'
+    
     def save_model(self, filepath: str) -> None:
-        """Save the trained model and scaler."""
+        """Save the trained model and its feature schema.
+
+        The CatBoost model is written in its native binary format next to
+        ``filepath``; ``filepath`` itself holds the compressed metadata.
+        """
         if self.model is None:
             raise ValueError("No trained model to save")
         
+        native_path = self.native_model_path(filepath)
+        self.model.save_model(native_path, format='cbm')
+        
         model_data = {
-            'model': self.model,
-            'scaler': self.scaler,
+            'model_file': os.path.basename(native_path),
             'feature_columns': self.feature_columns,
             'categorical_columns': self.categorical_columns,
+            'num_medians': self._num_medians,
+            'cat_categories': self._cat_categories,
+            'cat_codes': self._cat_codes,
             'target_column': self.target_column,
             'effort_limit': self.effort_limit,
             'model_metrics': self.model_metrics,
             'is_trained': self.is_trained
         }
+        if self.scale_numerical:
+            model_data['scaler'] = self.scaler
         
-        joblib.dump(model_data, filepath)
-        logger.info(f"Model saved to {filepath}")
+        joblib.dump(model_data, filepath, compress=3)
+        logger.info(f"Model saved to {filepath} (CatBoost model: {native_path})")
     
     def load_model(self, filepath: str) -> None:
-        """Load a trained model and scaler."""
+        """Load a trained model and its feature schema."""
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"Model file not found: {filepath}")
         
         model_data = joblib.load(filepath)
         
-        self.model = model_data['model']
-        self.scaler = model_data['scaler']
+        if 'model' in model_data:
+            # Older model files pickle the CatBoost model itself
+            self.model = model_data['model']
+        else:
+            native_path = os.path.join(os.path.dirname(filepath), model_data['model_file'])
+            if not os.path.exists(native_path):
+                raise FileNotFoundError(f"CatBoost model file not found: {native_path}")
+            self.model = CatBoostRegressor()
+            self.model.load_model(native_path, format='cbm')
+        # Older model files were trained on standardized numerical features
+        self.scaler = model_data.get('scaler')
+        self.scale_numerical = self.scaler is not None
+        self._set_scaling_stats()
         self.feature_columns = model_data['feature_columns']
         self.categorical_columns = model_data['categorical_columns']
+        # Older model files don't carry the feature schema
+        self._num_medians = model_data.get('num_medians', {})
+        self._cat_categories = model_data.get('cat_categories', {})
+        self._cat_codes = model_data.get('cat_codes', False)
         self.target_column = model_data['target_column']
         self.effort_limit = model_data['effort_limit']
         self.model_metrics = model_data['model_metrics']
+        self._feature_importance = dict(self.model_metrics.get('feature_importance', {}))
         self.is_trained = model_data['is_trained']
         
         logger.info(f"Model loaded from {filepath}")
@@ -374,62 +644,75 @@ class CatBoostEffortModel:
             'effort_limit': self.effort_limit,
             'feature_count': len(self.feature_columns),
             'categorical_features': len(self.categorical_columns),
+            'feature_importance': self._get_feature_importance(),
             'metrics': self.model_metrics
         }
     
     def cross_validate(self, df: pd.DataFrame, cv_folds: int = 5) -> Dict[str, float]:
         """Perform K-fold cross-validation."""
-        from sklearn.model_selection import cross_val_score
-        
-        df_processed = self.prepare_features(df)
-        train_data = df_processed.dropna(subset=[self.target_column])
-        
+        # Prepare features once, only for the rows that have a target
+        train_data = self._transform_features(df[df[self.target_column].notna()])
         X = train_data[self.feature_columns]
-        y = train_data[self.target_column]
         
         # Cap target values at the effort limit (30 hours max)
-        y_capped = y.clip(upper=self.effort_limit)
-        
-        # Scale numerical features
-        numerical_features = [col for col in self.feature_columns 
-                            if col not in self.categorical_columns]
-        
-        if numerical_features:
-            X_scaled = X.copy()
-            X_scaled[numerical_features] = self.scaler.fit_transform(X[numerical_features])
-        else:
-            X_scaled = X.copy()
+        y_values = np.minimum(train_data[self.target_column].to_numpy(), self.effort_limit)
         
-        # Perform cross-validation
-        model = CatBoostRegressor(**self.catboost_params)
+        # Every fold trains a fresh tree model, and trees are invariant to
+        # feature scaling, so numerical features are never scaled here (even
+        # for models that scale at predict time). Fitting a scaler on all rows
+        # before splitting would also leak validation-fold statistics.
         
         # Get categorical feature indices for training
         cat_features = [i for i, col in enumerate(self.feature_columns) 
                        if col in self.categorical_columns]
         
-        # For cross-validation, we need to create a custom scorer that handles categorical features
+        # Build the pool once and slice it per fold instead of converting
+        # every fold's DataFrame again. Training slices are pre-quantized;
+        # CatBoost can't predict from quantized categorical data, so
+        # validation slices stay raw.
+        full_pool = Pool(X, y_values, cat_features=cat_features)
+        
         from sklearn.model_selection import KFold
-        from sklearn.metrics import make_scorer
         
         kf = KFold(n_splits=cv_folds, shuffle=True, random_state=42)
-        cv_scores = []
         
-        for train_idx, val_idx in kf.split(X_scaled):
-            X_train_fold, X_val_fold = X_scaled.iloc[train_idx], X_scaled.iloc[val_idx]
-            y_train_fold, y_val_fold = y_capped.iloc[train_idx], y_capped.iloc[val_idx]
-            
+        # Folds run concurrently on CPU, so split the cores between them
+        # instead of letting every fold model claim all of them; GPU folds
+        # share a single device and run one at a time
+        n_jobs = 1 if self._use_gpu else cv_folds
+        fold_params = dict(self.catboost_params)
+        if not self._use_gpu:
+            fold_params['thread_count'] = max(1, self.catboost_params['thread_count'] // cv_folds)
+        
+        def fit_fold(train_pool: Pool, val_pool: Pool, val_idx: np.ndarray) -> float:
             # Train model on fold
-            fold_model = CatBoostRegressor(**self.catboost_params)
-            fold_model.fit(X_train_fold, y_train_fold, cat_features=cat_features, verbose=False)
+            fold_model = CatBoostRegressor(**fold_params)
+            fold_model.fit(train_pool, verbose=False)
             
             # Predict on validation set
-            y_pred_fold = fold_model.predict(X_val_fold)
+            y_pred_fold = fold_model.predict(
+                val_pool,
+                task_type='GPU' if self._use_gpu else 'CPU'
+            )
             
-            # Calculate MSE
-            mse = mean_squared_error(y_val_fold, y_pred_fold)
-            cv_scores.append(-mse)  # Negative for consistency with cross_val_score
-        
-        cv_scores = np.array(cv_scores)
+            # Calculate MSE, negative for consistency with cross_val_score
+            return -mean_squared_error(y_values[val_idx], y_pred_fold)
+        
+        # Pools aren't safe to share between concurrent fits, so every fold
+        # gets its own training pool, sliced and quantized up front; only the
+        # fits run concurrently
+        folds = []
+        for train_idx, val_idx in kf.split(X):
+            train_pool = full_pool.slice(train_idx)
+            train_pool.quantize()
+            folds.append((train_pool, full_pool.slice(val_idx), val_idx))
+        
+        # CatBoost releases the GIL while fitting and Pools can't be pickled
+        # to worker processes, so the folds run on threads
+        cv_scores = np.array(Parallel(n_jobs=n_jobs, backend='threading')(
+            delayed(fit_fold)(train_pool, val_pool, val_idx)
+            for train_pool, val_pool, val_idx in folds
+        ))
         
         return {
             'cv_rmse_mean': np.sqrt(-cv_scores.mean()),
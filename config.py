@@ -4,22 +4,30 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Business rules and upload limits as plain module constants
+EFFORT_EXPENSE_LIMIT: int = 30
+MISSING_VALUE_THRESHOLD: float = 0.1  # 10% threshold for missing values
+MAX_FILE_SIZE: int = 50 * 1024 * 1024  # 50MB
+ALLOWED_EXTENSIONS: tuple = ('.xlsx', '.xls', '.csv')
+
 class Config:
     # Microsoft 365 Graph API Configuration
     TENANT_ID = os.getenv('TENANT_ID')
     CLIENT_ID = os.getenv('CLIENT_ID')
     CLIENT_SECRET = os.getenv('CLIENT_SECRET')
+    # MSAL token cache file, so restarts reuse a still-valid token
+    MSAL_TOKEN_CACHE_PATH = os.getenv('MSAL_TOKEN_CACHE_PATH', '.msal_token_cache.json')
     
     # n8n Configuration
     N8N_WEBHOOK_URL = os.getenv('N8N_WEBHOOK_URL')
     
     # Business Rules Configuration
-    EFFORT_EXPENSE_LIMIT = 30
-    MISSING_VALUE_THRESHOLD = 0.1  # 10% threshold for missing values
+    EFFORT_EXPENSE_LIMIT = EFFORT_EXPENSE_LIMIT
+    MISSING_VALUE_THRESHOLD = MISSING_VALUE_THRESHOLD
     
     # File Upload Configuration
-    MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
-    ALLOWED_EXTENSIONS = ['.xlsx', '.xls', '.csv']
+    MAX_FILE_SIZE = MAX_FILE_SIZE
+    ALLOWED_EXTENSIONS = ALLOWED_EXTENSIONS
     
     # Notification Configuration
     EMAIL_TEMPLATE = "effort_expense_notification.html"
@@ -3,68 +3,202 @@ import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional, Any
 import logging
-from catboost_model import CatBoostEffortModel
-from model_storage import ModelStorage
+import io
+import codecs
+import time
+import importlib.util
+import itertools
+from pathlib import Path
+from pandas.tseries.api import guess_datetime_format
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Use the multithreaded Arrow CSV parser and the Rust calamine Excel reader
+# when they are installed; otherwise pandas' defaults
+_HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+_CSV_ENGINE = 'pyarrow' if _HAS_PYARROW else 'c'
+_EXCEL_ENGINE = 'calamine' if importlib.util.find_spec('python_calamine') else None
+
+# Detect the encoding of non-UTF-8 CSVs from their first 64 KB when
+# charset-normalizer (installed with requests) is available
+_HAS_CHARSET_NORMALIZER = importlib.util.find_spec('charset_normalizer') is not None
+_ENCODING_SAMPLE_SIZE = 64 * 1024
+
+# Arrow-backed strings that keep NaN for missing values (pandas 3's default
+# str dtype); older pandas spells it 'pyarrow_numpy'
+_ARROW_STRING_DTYPE = None
+if _HAS_PYARROW:
+    try:
+        _ARROW_STRING_DTYPE = pd.StringDtype('pyarrow', na_value=np.nan)
+    except TypeError:
+        _ARROW_STRING_DTYPE = pd.StringDtype('pyarrow_numpy')
+
+def _to_arrow_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """Store object columns holding only strings as Arrow-backed strings."""
+    if _ARROW_STRING_DTYPE is None:
+        return df
+    
+    string_columns = {
+        col: df[col].astype(_ARROW_STRING_DTYPE)
+        for col in df.columns[df.dtypes == object]
+        if pd.api.types.infer_dtype(df[col], skipna=True) == 'string'
+    }
+    return df.assign(**string_columns) if string_columns else df
+
+def _parse_dates(values: pd.Series) -> pd.Series:
+    """Convert a column to datetime64, coercing unparseable values to NaT.
+
+    The format is guessed once from the first value and string columns are
+    parsed with Arrow's strptime when possible; anything else (timezones,
+    fractional seconds, mixed objects) goes through pd.to_datetime.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    
+    non_null = values.dropna()
+    if _HAS_PYARROW and len(non_null) and pd.api.types.is_string_dtype(values) \
+            and isinstance(non_null.iloc[0], str):
+        fmt = guess_datetime_format(non_null.iloc[0])
+        if fmt and '%z' not in fmt and '%f' not in fmt:
+            try:
+                import pyarrow as pa
+                import pyarrow.compute as pc
+                
+                parsed = pc.strptime(pa.array(values, type=pa.string(), from_pandas=True),
+                                     format=fmt, unit='us', error_is_null=True)
+                return pd.Series(parsed.to_pandas(), index=values.index, name=values.name)
+            except Exception as e:
+                logger.debug(f"Arrow date parsing failed for {values.name}: {str(e)}")
+    
+    return pd.to_datetime(values, errors='coerce')
+
+def _candidate_encodings(raw: bytes):
+    """Yield the encodings to try for CSV bytes, most likely first."""
+    yield 'utf-8'
+    fallbacks = ['latin-1', 'cp1252', 'iso-8859-1']
+    if _HAS_CHARSET_NORMALIZER:
+        from charset_normalizer import from_bytes
+        
+        # Only let detection reorder the supported fallbacks: the best
+        # overall guess from a sample is often a neighbouring code page
+        # (e.g. cp1250 for Western European text)
+        supported = {codecs.lookup(encoding).name: encoding for encoding in fallbacks}
+        for match in from_bytes(raw[:_ENCODING_SAMPLE_SIZE]):
+            detected = supported.get(codecs.lookup(match.encoding).name)
+            if detected:
+                yield detected
+                break
+    yield from fallbacks
+
+def _read_excel(file_input) -> pd.DataFrame:
+    """Read an Excel workbook from a path or uploaded file."""
+    return pd.read_excel(file_input, engine=_EXCEL_ENGINE)
+
+def _read_csv(file_input) -> pd.DataFrame:
+    """Decode CSV bytes with the first supported encoding and parse them once."""
+    if hasattr(file_input, 'read'):
+        file_input.seek(0)  # Reset file pointer
+        raw = file_input.read()
+    else:
+        with open(file_input, 'rb') as f:
+            raw = f.read()
+    
+    # Try different encodings for CSV files on the raw bytes, so a wrong
+    # guess doesn't cost a full parse. Files that aren't UTF-8 try the
+    # encoding detected from a sample before the fixed fallbacks.
+    text = None
+    for encoding in _candidate_encodings(raw):
+        try:
+            text = raw.decode(encoding)
+            logger.info(f"Successfully loaded CSV with {encoding} encoding")
+            break
+        except UnicodeDecodeError:
+            continue
+    
+    if text is None:
+        raise ValueError("Could not decode CSV file with any supported encoding")
+    
+    buffer = io.BytesIO(text.encode('utf-8'))
+    if _CSV_ENGINE == 'pyarrow':
+        try:
+            return pd.read_csv(buffer, engine='pyarrow')
+        except Exception as e:
+            # Fall back to the pandas parser for inputs pyarrow rejects
+            logger.warning(f"PyArrow CSV parsing failed, using pandas parser: {str(e)}")
+            buffer.seek(0)
+    return pd.read_csv(buffer)
+
+# Notification key -> (source column, default when the column is absent)
+_NOTIFICATION_FIELDS = {
+    'user_email': ('Email', ''),
+    'user_name': ('keyEffortUser', ''),
+    'userid': ('updUserOid', ''),
+    'project_name': ('name_P', ''),
+    'task_name': ('Task Name', ''),
+    'effort_date': ('effortDate', ''),
+    'original_effort': ('effortExpense_original', None),
+    'predicted_effort': ('effortExpense_predicted', None),
+    'final_effort': ('effortExpense_final', None),
+    'issue_type': ('is_missing_effort', None),
+    'billing_rate': ('billingRate_hourlyRate', None),
+    'effort_costs': ('effortTimeCosts', None),
+    'job_title': ('msg_JobTitle', ''),
+    'community': ('msg_Community', '')
+}
+
+# File suffix -> reader for load_data
+_READERS = {
+    '.xlsx': _read_excel,
+    '.xls': _read_excel,
+    '.csv': _read_csv
+}
+
+# Process-wide source of DataProcessor.model_version stamps
+_MODEL_VERSIONS = itertools.count(1)
+
 class DataProcessor:
     """Handles data preprocessing and effort expense prediction using ML models."""
     
+    # Seconds a model database lookup is reused before querying again
+    STORAGE_CACHE_TTL = 30
+    
     def __init__(self, effort_limit: int = 30, missing_threshold: float = 0.1):
+        # Deferred so importing this module doesn't pay for loading CatBoost
+        from catboost_model import CatBoostEffortModel
+        from model_storage import get_model_storage
+        
         self.effort_limit = effort_limit
         self.missing_threshold = missing_threshold
         self.ml_model = CatBoostEffortModel(effort_limit=effort_limit)
         self.is_model_trained = False
-        self.model_storage = ModelStorage()
+        # Changes whenever a model is trained or loaded, unique across
+        # processors, so callers can key cached predictions on it
+        self.model_version = 0
+        # Shared with every other processor on the same database
+        self.model_storage = get_model_storage()
+        # Feature Pool of the last predicted frame, reused when the same frame
+        # object is predicted again. This and the frame caches below hold one
+        # (key, frame, value) tuple, read and replaced as a whole, so threads
+        # sharing a processor never pair one frame's key with another's value;
+        # the frame is kept so its id stays unique
+        self._pred_pool = None
+        # Cross-validation results for the current model and last validated frame object
+        self._cv_cache = None
+        # Sorted feature importance table of the current model, built on first use
+        self._feature_importance_df = None
+        # Model database lookups, keyed by query name -> (fetched_at, result)
+        self._storage_cache = {}
         
     def load_data(self, file_input) -> pd.DataFrame:
         """Load data from Excel or CSV file."""
         try:
             # Handle both file paths and Streamlit UploadedFile objects
-            if hasattr(file_input, 'name'):
-                # Streamlit UploadedFile object
-                file_name = file_input.name
-                if file_name.endswith(('.xlsx', '.xls')):
-                    df = pd.read_excel(file_input)
-                elif file_name.endswith('.csv'):
-                    # Try different encodings for CSV files
-                    encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-                    df = None
-                    for encoding in encodings:
-                        try:
-                            file_input.seek(0)  # Reset file pointer
-                            df = pd.read_csv(file_input, encoding=encoding)
-                            logger.info(f"Successfully loaded CSV with {encoding} encoding")
-                            break
-                        except UnicodeDecodeError:
-                            continue
-                    
-                    if df is None:
-                        raise ValueError("Could not decode CSV file with any supported encoding")
-                else:
-                    raise ValueError("Unsupported file format. Please use Excel or CSV files.")
-            else:
-                # Regular file path string
-                if file_input.endswith(('.xlsx', '.xls')):
-                    df = pd.read_excel(file_input)
-                elif file_input.endswith('.csv'):
-                    # Try different encodings for CSV files
-                    encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-                    df = None
-                    for encoding in encodings:
-                        try:
-                            df = pd.read_csv(file_input, encoding=encoding)
-                            logger.info(f"Successfully loaded CSV with {encoding} encoding")
-                            break
-                        except UnicodeDecodeError:
-                            continue
-                    
-                    if df is None:
-                        raise ValueError("Could not decode CSV file with any supported encoding")
-                else:
-                    raise ValueError("Unsupported file format. Please use Excel or CSV files.")
+            file_name = getattr(file_input, 'name', file_input)
+            reader = _READERS.get(Path(file_name).suffix.lower())
+            if reader is None:
+                raise ValueError("Unsupported file format. Please use Excel or CSV files.")
+            df = _to_arrow_strings(reader(file_input))
             
             logger.info(f"Successfully loaded data with {len(df)} rows and {len(df.columns)} columns")
             return df
@@ -74,28 +208,45 @@ class DataProcessor:
     
     def preprocess_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Preprocess the data for analysis."""
-        df_processed = df.copy()
+        # Columns are only ever replaced or added below, never written in
+        # place, so a shallow copy is enough to leave the input untouched
+        df_processed = df.copy(deep=False)
         
         # Convert date columns
         date_columns = ['effortDate', 'startDate', 'endDate', 'startDate_P', 'startDate_T']
-        for col in date_columns:
-            if col in df_processed.columns:
-                df_processed[col] = pd.to_datetime(df_processed[col], errors='coerce')
+        df_processed = df_processed.assign(**{
+            col: _parse_dates(df_processed[col])
+            for col in date_columns if col in df_processed.columns
+        })
         
-        # Handle missing values in effortExpense
-        df_processed['effortExpense_original'] = df_processed['effortExpense'].copy()
-        df_processed['is_missing_effort'] = df_processed['effortExpense'].isna()
-        
-        # Create flags for analysis
-        df_processed['is_over_limit'] = df_processed['effortExpense'] > self.effort_limit
-        df_processed['needs_prediction'] = df_processed['is_missing_effort'] | df_processed['is_over_limit']
+        # Handle missing values in effortExpense and create flags for analysis,
+        # computed on the raw values and added in a single assign
+        effort = df_processed['effortExpense'].to_numpy(dtype=np.float64, na_value=np.nan)
+        is_missing = np.isnan(effort)
+        is_over_limit = effort > self.effort_limit
+        df_processed = df_processed.assign(
+            effortExpense_original=df_processed['effortExpense'].copy(),
+            is_missing_effort=is_missing,
+            is_over_limit=is_over_limit,
+            needs_prediction=is_missing | is_over_limit
+        )
         
-        # Extract time features
+        # Extract time features in one datetime64 decomposition pass
         if 'effortDate' in df_processed.columns:
-            df_processed['effort_year'] = df_processed['effortDate'].dt.year
-            df_processed['effort_month'] = df_processed['effortDate'].dt.month
-            df_processed['effort_quarter'] = df_processed['effortDate'].dt.quarter
-            df_processed['effort_weekday'] = df_processed['effortDate'].dt.dayofweek
+            dates = df_processed['effortDate'].to_numpy(dtype='datetime64[D]')
+            years = dates.astype('datetime64[Y]')
+            months = dates.astype('datetime64[M]')
+            month = (months - years.astype('datetime64[M]')).astype(np.int32) + 1
+            time_features = {
+                'effort_year': years.astype(np.int32) + 1970,
+                'effort_month': month,
+                'effort_quarter': (month - 1) // 3 + 1,
+                'effort_weekday': (dates.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+            }
+            is_nat = np.isnat(dates)
+            for col, values in time_features.items():
+                time_features[col] = np.where(is_nat, np.nan, values) if is_nat.any() else values.astype(np.int32)
+            df_processed = df_processed.assign(**time_features)
         
         # Calculate project duration
         if 'startDate_P' in df_processed.columns and 'endDate' in df_processed.columns:
@@ -103,7 +254,18 @@ class DataProcessor:
         
         # Create cost efficiency ratio
         if 'effortTimeCosts' in df_processed.columns and 'billingRate_hourlyRate' in df_processed.columns:
-            df_processed['cost_efficiency_ratio'] = df_processed['effortTimeCosts'] / df_processed['billingRate_hourlyRate'].replace(0, np.nan)
+            costs = df_processed['effortTimeCosts'].to_numpy(dtype=np.float64, na_value=np.nan)
+            rates = df_processed['billingRate_hourlyRate'].to_numpy(dtype=np.float64, na_value=np.nan)
+            # Zero billing rates give NaN, without materializing a replaced copy
+            ratio = np.full(costs.shape, np.nan)
+            np.divide(costs, rates, out=ratio, where=rates != 0)
+            df_processed['cost_efficiency_ratio'] = ratio
+        
+        # Store the model's categorical features as pandas categoricals so
+        # they are held as integer codes and map to the model's codes cheaply
+        for col in self.ml_model.categorical_columns or self.ml_model.CATEGORICAL_COLUMNS:
+            if col in df_processed.columns:
+                df_processed[col] = df_processed[col].astype('category')
         
         logger.info(f"Data preprocessing completed. {df_processed['needs_prediction'].sum()} rows need prediction.")
         return df_processed
@@ -116,6 +278,7 @@ class DataProcessor:
             # Train the model with fast mode by default
             metrics = self.ml_model.train_model(df, hyperparameter_tuning=hyperparameter_tuning, fast_mode=fast_mode)
             self.is_model_trained = True
+            self._clear_prediction_cache()
             
             logger.info(f"Model training completed successfully!")
             logger.info(f"Model type: CatBoost")
@@ -136,15 +299,24 @@ class DataProcessor:
         logger.info("Making predictions using trained ML model...")
         
         try:
+            # Reuse the converted features when the same frame is predicted again
+            key = (id(df), df.shape, tuple(df.columns))
+            cached = self._pred_pool
+            if cached is None or cached[0] != key:
+                cached = (key, df, self.ml_model.prediction_pool(df))
+                self._pred_pool = cached
+            
             # Use ML model for predictions
-            df_predicted = self.ml_model.predict(df)
+            df_predicted = self.ml_model.predict(df, pool=cached[2])
             
-            # Add original values for comparison
-            df_predicted['effortExpense_original'] = df['effortExpense'].copy()
+            # Add original values for comparison; predict works on a new frame
+            # and never writes to df, so its values can be shared
+            df_predicted['effortExpense_original'] = df['effortExpense'].values
             
             logger.info(f"Predictions completed successfully!")
-            logger.info(f"Missing values predicted: {df_predicted['is_missing_effort'].sum()}")
-            logger.info(f"Over-limit values flagged: {df_predicted['is_over_limit'].sum()}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"Missing values predicted: {df_predicted['is_missing_effort'].sum()}")
+                logger.info(f"Over-limit values flagged: {df_predicted['is_over_limit'].sum()}")
             
             return df_predicted
             
@@ -152,6 +324,13 @@ class DataProcessor:
             logger.error(f"Error making predictions: {str(e)}")
             raise
     
+    def _clear_prediction_cache(self) -> None:
+        """Drop the cached prediction Pool, CV results and importance table and bump model_version after the model changes."""
+        self.model_version = next(_MODEL_VERSIONS)
+        self._pred_pool = None
+        self._cv_cache = None
+        self._feature_importance_df = None
+    
     def save_model(self, filepath: str = None) -> str:
         """Save the trained model to file and database."""
         if not self.is_model_trained:
@@ -175,6 +354,7 @@ class DataProcessor:
             training_samples=self.ml_model.model_metrics.get('training_samples', 0),
             effort_limit=self.effort_limit
         )
+        self._storage_cache.clear()
         
         logger.info(f"Model saved to {filepath} and database (ID: {model_id})")
         return filepath
@@ -183,7 +363,7 @@ class DataProcessor:
         """Load a trained model from file or database."""
         if filepath is None:
             # Load the most recent active model from database
-            active_model = self.model_storage.get_active_model()
+            active_model = self._cached_storage_query('active_model', self.model_storage.get_active_model)
             if active_model:
                 filepath = active_model['file_path']
                 logger.info(f"Loading active model from database: {filepath}")
@@ -192,15 +372,30 @@ class DataProcessor:
         
         self.ml_model.load_model(filepath)
         self.is_model_trained = True
+        self._clear_prediction_cache()
         logger.info(f"Model loaded from {filepath}")
     
+    def _cached_storage_query(self, key: str, query):
+        """Run a model database query, reusing its result for STORAGE_CACHE_TTL seconds."""
+        cached = self._storage_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] <= self.STORAGE_CACHE_TTL:
+            return cached[1]
+        
+        result = query()
+        self._storage_cache[key] = (time.monotonic(), result)
+        return result
+    
     def get_saved_models(self) -> List[Dict[str, Any]]:
         """Get list of all saved models from database."""
-        return self.model_storage.get_all_models()
+        return self._cached_storage_query('all_models', self.model_storage.get_all_models)
+    
+    def list_saved_models(self) -> List[Dict[str, Any]]:
+        """Get saved models without their metrics, for listing."""
+        return self._cached_storage_query('model_list', self.model_storage.list_models_lightweight)
     
     def get_model_stats(self) -> Dict[str, Any]:
         """Get model storage statistics."""
-        return self.model_storage.get_model_stats()
+        return self._cached_storage_query('model_stats', self.model_storage.get_model_stats)
     
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the trained model."""
@@ -209,15 +404,66 @@ class DataProcessor:
         
         return self.ml_model.get_model_info()
     
-    def cross_validate_model(self, df: pd.DataFrame, cv_folds: int = 5) -> Dict[str, float]:
-        """Perform cross-validation on the model."""
+    @property
+    def feature_importance_df(self) -> pd.DataFrame:
+        """Feature importances of the current model, most important first.
+
+        Built from the model metrics once per trained or loaded model and
+        cached on the processor; empty when there is no model.
+        """
+        if self._feature_importance_df is None:
+            importance = {}
+            if self.is_model_trained:
+                importance = self.ml_model.model_metrics.get('feature_importance') or {}
+            self._feature_importance_df = pd.DataFrame(
+                sorted(importance.items(), key=lambda item: item[1], reverse=True),
+                columns=['Feature', 'Importance']
+            )
+        return self._feature_importance_df
+    
+    def cross_validate_model(self, df: pd.DataFrame, cv_folds: int = 5,
+                             force: bool = False) -> Dict[str, float]:
+        """Perform cross-validation on the model.
+
+        Results are reused for the same model, frame object and fold count
+        unless ``force`` is set, since every call retrains ``cv_folds`` models.
+        """
         if not self.is_model_trained:
             raise ValueError("Model must be trained before cross-validation.")
         
-        return self.ml_model.cross_validate(df, cv_folds)
+        key = (self.model_version, id(df), df.shape, cv_folds)
+        cached = self._cv_cache
+        if force or cached is None or cached[0] != key:
+            cached = (key, df, self.ml_model.cross_validate(df, cv_folds))
+            self._cv_cache = cached
+        return cached[2]
+    
+    def postprocess(self, df: pd.DataFrame) -> Tuple[Dict[str, List[int]], Dict, List[Dict]]:
+        """Identify issues, build the summary and prepare notifications for a predicted frame.
+
+        Same results as identify_issues, generate_summary_report and
+        prepare_notification_data, but the flag columns are read once and
+        shared by all three.
+        """
+        missing_mask, over_limit_mask, needs_mask = self._issue_flags(df)
+        issues = self._issues_from_flags(df, missing_mask, over_limit_mask, needs_mask)
+        summary = self._summary_from_flags(df, missing_mask, over_limit_mask, needs_mask)
+        notification_data = self._notification_records(df.loc[missing_mask | over_limit_mask])
+        return issues, summary, notification_data
+    
+    def _issue_flags(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Missing, over-limit and needs-prediction flags of a predicted frame."""
+        return (df['is_missing_effort'].to_numpy(dtype=bool),
+                df['is_over_limit'].to_numpy(dtype=bool),
+                df['needs_prediction'].to_numpy(dtype=bool))
     
     def identify_issues(self, df: pd.DataFrame) -> Dict[str, List[int]]:
         """Identify rows with missing or over-limit effort expenses."""
+        return self._issues_from_flags(df, *self._issue_flags(df))
+    
+    def _issues_from_flags(self, df: pd.DataFrame, missing_mask: np.ndarray,
+                           over_limit_mask: np.ndarray, needs_mask: np.ndarray) -> Dict[str, List[int]]:
+        """Build the issues dict from the frame's flag arrays."""
         issues = {
             'missing_effort': [],
             'over_limit': [],
@@ -225,39 +471,46 @@ class DataProcessor:
             'needs_notification': []
         }
         
-        for idx, row in df.iterrows():
-            if row['is_missing_effort']:
-                issues['missing_effort'].append(idx)
-                issues['needs_notification'].append(idx)
-            
-            if row['is_over_limit']:
-                issues['over_limit'].append(idx)
-                issues['needs_notification'].append(idx)
-            
-            if row['needs_prediction']:
-                issues['predicted_values'].append({
-                    'index': idx,
-                    'original': row.get('effortExpense_original'),
-                    'predicted': row.get('effortExpense_predicted'),
-                    'final': row.get('effortExpense_final'),
-                    'reason': 'missing' if row['is_missing_effort'] else 'over_limit'
-                })
+        issues['missing_effort'] = df.index[missing_mask].tolist()
+        issues['over_limit'] = df.index[over_limit_mask].tolist()
+        issues['needs_notification'] = df.index[missing_mask | over_limit_mask].tolist()
+        
+        # Prediction details for every row that was predicted, built column-wise
+        columns = ['effortExpense_original', 'effortExpense_predicted', 'effortExpense_final']
+        predicted = df.loc[needs_mask].reindex(columns=columns)
+        issues['predicted_values'] = pd.DataFrame({
+            'index': predicted.index,
+            'original': predicted['effortExpense_original'].to_numpy(),
+            'predicted': predicted['effortExpense_predicted'].to_numpy(),
+            'final': predicted['effortExpense_final'].to_numpy(),
+            'reason': np.where(missing_mask[needs_mask], 'missing', 'over_limit')
+        }).to_dict('records')
         
         return issues
     
-    def generate_summary_report(self, df: pd.DataFrame, issues: Dict) -> Dict:
-        """Generate a summary report of the analysis."""
+    def generate_summary_report(self, df: pd.DataFrame, issues: Optional[Dict] = None) -> Dict:
+        """Generate a summary report of the analysis, counted from the frame's issue flags.
+
+        issues is deprecated and ignored; it is only kept so existing callers
+        that still pass identify_issues' result keep working.
+        """
+        return self._summary_from_flags(df, *self._issue_flags(df))
+    
+    def _summary_from_flags(self, df: pd.DataFrame, missing_mask: np.ndarray,
+                            over_limit_mask: np.ndarray, needs_mask: np.ndarray) -> Dict:
+        """Build the summary report from the frame's flag arrays."""
+        # Every flagged row is both predicted and notified
         total_rows = len(df)
-        missing_count = len(issues['missing_effort'])
-        over_limit_count = len(issues['over_limit'])
-        predicted_count = len(issues['predicted_values'])
+        missing_count = int(np.count_nonzero(missing_mask))
+        over_limit_count = int(np.count_nonzero(over_limit_mask))
+        predicted_count = int(np.count_nonzero(needs_mask))
         
         summary = {
             'total_rows': total_rows,
             'missing_effort_count': missing_count,
             'over_limit_count': over_limit_count,
             'predicted_count': predicted_count,
-            'notification_count': len(issues['needs_notification']),
+            'notification_count': predicted_count,
             'missing_percentage': (missing_count / total_rows) * 100 if total_rows > 0 else 0,
             'over_limit_percentage': (over_limit_count / total_rows) * 100 if total_rows > 0 else 0,
             'prediction_accuracy': self._calculate_prediction_accuracy(df)
@@ -273,26 +526,19 @@ class DataProcessor:
     
     def prepare_notification_data(self, df: pd.DataFrame, issues: Dict) -> List[Dict]:
         """Prepare data for notifications."""
-        notification_data = []
+        return self._notification_records(df.loc[issues['needs_notification']])
+    
+    def _notification_records(self, rows: pd.DataFrame) -> List[Dict]:
+        """Build one notification record per flagged row."""
+        columns = {}
+        for key, (column, default) in _NOTIFICATION_FIELDS.items():
+            if key == 'issue_type':
+                columns[key] = np.where(rows['is_missing_effort'].to_numpy(dtype=bool), 'missing', 'over_limit')
+            elif column in rows.columns:
+                columns[key] = rows[column].to_numpy(dtype=object)
+            else:
+                columns[key] = np.full(len(rows), default, dtype=object)
         
-        for idx in issues['needs_notification']:
-            row = df.iloc[idx]
-            notification = {
-                'user_email': row.get('Email', ''),
-                'user_name': row.get('keyEffortUser', ''),
-                'userid': row.get('updUserOid', ''),
-                'project_name': row.get('name_P', ''),
-                'task_name': row.get('Task Name', ''),
-                'effort_date': row.get('effortDate', ''),
-                'original_effort': row.get('effortExpense_original'),
-                'predicted_effort': row.get('effortExpense_predicted'),
-                'final_effort': row.get('effortExpense_final'),
-                'issue_type': 'missing' if row['is_missing_effort'] else 'over_limit',
-                'billing_rate': row.get('billingRate_hourlyRate'),
-                'effort_costs': row.get('effortTimeCosts'),
-                'job_title': row.get('msg_JobTitle', ''),
-                'community': row.get('msg_Community', '')
-            }
-            notification_data.append(notification)
+        notification_data = pd.DataFrame(columns, index=rows.index).to_dict('records')
         
         return notification_data
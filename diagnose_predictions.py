@@ -4,10 +4,7 @@ Diagnostic script to analyze ML prediction issues
 Run this to understand why predictions might be crossing 30 hours
 """
 
-import pandas as pd
-import numpy as np
 import os
-from data_processor import DataProcessor
 
 def analyze_training_data(file_path):
     """Analyze the training data for potential issues."""
@@ -15,6 +12,10 @@ def analyze_training_data(file_path):
     print("=" * 50)
     
     try:
+        # pandas is only needed once there is data to analyze
+        import numpy as np
+        import pandas as pd
+        
         # Load data
         df = pd.read_csv(file_path)
         print(f"✅ Data loaded successfully: {len(df)} rows")
@@ -33,21 +34,30 @@ def analyze_training_data(file_path):
         print(f"Missing values: {df[effort_col].isna().sum()}")
         
         if len(effort_data) > 0:
+            # Sort once; the median, extremes and every threshold/bucket
+            # count below are then O(log n) lookups instead of a filtered
+            # pass over the column each
+            values = np.sort(effort_data.to_numpy(dtype=np.float64))
+            n_values = len(values)
+            
+            def count_above(threshold):
+                return n_values - int(np.searchsorted(values, threshold, side='right'))
+            
             print(f"\nEffort Expense Statistics:")
-            print(f"  Mean: {effort_data.mean():.2f} hours")
-            print(f"  Median: {effort_data.median():.2f} hours")
-            print(f"  Std: {effort_data.std():.2f} hours")
-            print(f"  Min: {effort_data.min():.2f} hours")
-            print(f"  Max: {effort_data.max():.2f} hours")
+            print(f"  Mean: {values.mean():.2f} hours")
+            print(f"  Median: {np.median(values):.2f} hours")
+            print(f"  Std: {values.std(ddof=1) if n_values > 1 else float('nan'):.2f} hours")
+            print(f"  Min: {values[0]:.2f} hours")
+            print(f"  Max: {values[-1]:.2f} hours")
             
             # Check for extreme values
             print(f"\n🚨 EXTREME VALUES CHECK:")
-            print(f"  Values > 30 hours: {len(effort_data[effort_data > 30])}")
-            print(f"  Values > 40 hours: {len(effort_data[effort_data > 40])}")
-            print(f"  Values > 50 hours: {len(effort_data[effort_data > 50])}")
+            print(f"  Values > 30 hours: {count_above(30)}")
+            print(f"  Values > 40 hours: {count_above(40)}")
+            print(f"  Values > 50 hours: {count_above(50)}")
             
-            if len(effort_data[effort_data > 50]) > 0:
-                print(f"\n⚠️  WARNING: Found {len(effort_data[effort_data > 50])} extreme values (>50 hours)")
+            if count_above(50) > 0:
+                print(f"\n⚠️  WARNING: Found {count_above(50)} extreme values (>50 hours)")
                 print("   These might be teaching the model wrong patterns!")
                 extreme_values = effort_data[effort_data > 50]
                 print(f"   Extreme values: {extreme_values.tolist()}")
@@ -63,9 +73,11 @@ def analyze_training_data(file_path):
                 (50, float('inf'), "50+ hours")
             ]
             
-            for min_val, max_val, label in ranges:
-                count = len(effort_data[(effort_data >= min_val) & (effort_data < max_val)])
-                percentage = (count / len(effort_data)) * 100
+            # Rows in [min_val, max_val) for every range from one searchsorted
+            edges = np.searchsorted(values, [bound for r in ranges for bound in r[:2]], side='left')
+            for (min_val, max_val, label), (lo, hi) in zip(ranges, edges.reshape(-1, 2)):
+                count = int(hi - lo)
+                percentage = (count / n_values) * 100
                 print(f"  {label}: {count} rows ({percentage:.1f}%)")
         
         # Check other important columns
@@ -90,6 +102,8 @@ def test_model_training(df):
     print("=" * 50)
     
     try:
+        from data_processor import DataProcessor
+        
         # Initialize processor
         processor = DataProcessor(model_type='lightgbm')
         
@@ -104,7 +118,7 @@ def test_model_training(df):
         if len(training_data) < 10:
             print("❌ ERROR: Not enough training data!")
             print("   Need at least 10 rows with effort expense values")
-            return None
+            return None, None, None
         
         # Train model
         print("🚀 Training model...")
@@ -131,20 +145,19 @@ def test_model_training(df):
             for i, (feature, imp) in enumerate(sorted_features[:10]):
                 print(f"  {i+1:2d}. {feature}: {imp:.4f}")
         
-        return processor, metrics
+        return processor, metrics, df_processed
         
     except Exception as e:
         print(f"❌ Error training model: {str(e)}")
-        return None, None
+        return None, None, None
 
-def test_predictions(processor, df):
-    """Test predictions and analyze results."""
+def test_predictions(processor, df_processed):
+    """Test predictions on the already preprocessed data and analyze results."""
     print(f"\n🔮 TESTING PREDICTIONS")
     print("=" * 50)
     
     try:
-        # Preprocess data
-        df_processed = processor.preprocess_data(df)
+        import numpy as np
         
         # Make predictions
         df_predicted = processor.predict_effort_expenses(df_processed)
@@ -179,16 +192,13 @@ def test_predictions(processor, df):
             
             # Check prediction distribution
             print(f"\n📈 PREDICTION DISTRIBUTION:")
-            ranges = [
-                (0, 10, "0-10 hours"),
-                (10, 20, "10-20 hours"),
-                (20, 30, "20-30 hours"),
-                (30, 40, "30-40 hours"),
-                (40, float('inf'), "40+ hours")
-            ]
+            bins = [0, 10, 20, 30, 40, np.inf]
+            labels = ["0-10 hours", "10-20 hours", "20-30 hours", "30-40 hours", "40+ hours"]
             
-            for min_val, max_val, label in ranges:
-                count = len(predictions[(predictions >= min_val) & (predictions < max_val)])
+            # One pass over the predictions for all buckets; predictions are
+            # finite, so the closed last bin matches the half-open ranges
+            counts, _ = np.histogram(predictions.to_numpy(dtype=np.float64), bins=bins)
+            for label, count in zip(labels, counts):
                 percentage = (count / len(predictions)) * 100
                 print(f"  {label}: {count} predictions ({percentage:.1f}%)")
         
@@ -212,10 +222,10 @@ def main():
         df = analyze_training_data(sample_file)
         
         if df is not None:
-            processor, metrics = test_model_training(df)
+            processor, metrics, df_processed = test_model_training(df)
             
             if processor is not None:
-                df_predicted = test_predictions(processor, df)
+                df_predicted = test_predictions(processor, df_processed)
                 
                 print(f"\n🎯 SUMMARY & RECOMMENDATIONS")
                 print("=" * 50)
@@ -0,0 +1,38 @@
+"""
+JSON serialisation shared by the webhook, Graph and report code
+"""
+
+import importlib.util
+import json
+import math
+
+# Serialise with orjson when installed, stdlib json otherwise; both write
+# NaN/inf as null, and values JSON can't represent natively (timestamps)
+# as strings
+_HAS_ORJSON = importlib.util.find_spec('orjson') is not None
+if _HAS_ORJSON:
+    import orjson
+
+def json_dumps(payload, indent: bool = False) -> bytes:
+    """Serialise a payload to UTF-8 JSON, with orjson when it is installed."""
+    if _HAS_ORJSON:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(payload, default=str, option=option)
+    return json.dumps(_finite(payload), indent=2 if indent else None,
+                      default=_json_default, allow_nan=False).encode('utf-8')
+
+def _finite(value):
+    """Copy of a payload with NaN/inf floats replaced by None, as orjson writes them."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+def _json_default(value):
+    """Convert NumPy values to Python ones and anything else to str."""
+    return _finite(value.tolist()) if hasattr(value, 'tolist') else str(value)
@@ -13,7 +13,6 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
 
 from config import Config
-from streamlit_app import main as run_streamlit_app
 
 def setup_logging():
     """Setup logging configuration."""
@@ -77,6 +76,10 @@ def main():
     print("\n" + "="*60 + "\n")
     
     try:
+        # Imported here so the environment checks above don't wait on
+        # Streamlit, pandas and CatBoost loading
+        from streamlit_app import main as run_streamlit_app
+        
         # Run Streamlit application
         logger.info("Starting Streamlit application...")
         run_streamlit_app()
@@ -1,13 +1,146 @@
 import msal
+import pandas as pd
 import requests
-import json
 import logging
+import os
+import string
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
+from urllib3.util.retry import Retry
 from typing import Dict, List, Optional
 from config import Config
+from json_utils import json_dumps
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Maximum number of requests Graph accepts in one $batch call
+GRAPH_BATCH_LIMIT = 20
+# Graph throttles a mailbox beyond 4 concurrent requests
+GRAPH_MAX_CONCURRENCY = 4
+
+# Retry failed connects and 502/503 responses (the request never reached
+# Graph) with exponential backoff; throttling (429) is handled by
+# AdaptiveRateLimiter instead, other errors fail straight away. Read errors,
+# dropped connections, 500 and 504 are not retried: Graph may already have
+# accepted the (non-idempotent) sendMail or $batch POST, and resending would
+# send the email twice
+HTTP_RETRY = Retry(
+    total=5,
+    read=0,
+    other=0,
+    backoff_factor=1.0,
+    status_forcelist=[502, 503],
+    allowed_methods=['POST'],
+    raise_on_status=False
+)
+# Times a throttled request is sent again after waiting out Retry-After
+MAX_THROTTLE_RETRIES = 5
+# Error statuses that can come after Graph has already queued a mail
+# (internal error, gateway timeout); a message failing with one is not resent
+AMBIGUOUS_SEND_STATUSES = frozenset({500, 504})
+
+class AdaptiveRateLimiter:
+    """Token bucket whose refill rate adapts to throttling (AIMD).
+
+    Every 429 halves the request rate and pauses admissions for Retry-After;
+    every success raises the rate additively. One instance is shared by all
+    threads sending through a client, so concurrent sends back off together.
+    """
+    
+    def __init__(self, rate: float = 10.0, min_rate: float = 0.5,
+                 max_rate: float = 50.0, increase: float = 0.5):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._blocked_until:
+                    elapsed = max(0.0, now - self._updated)
+                    self._tokens = min(max(1.0, self.rate), self._tokens + elapsed * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        return
+                    wait = (1.0 - self._tokens) / self.rate
+                else:
+                    wait = self._blocked_until - now
+            time.sleep(wait)
+    
+    def on_success(self) -> None:
+        """Ramp the rate up additively after an accepted request."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+    
+    def on_throttled(self, retry_after: float) -> None:
+        """Halve the rate and hold all requests for retry_after seconds."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+            self._updated = self._blocked_until
+            self._tokens = 0.0
+        logger.warning(f"Throttled; waiting {retry_after:.1f}s, rate now {self.rate:.2f} req/s")
+
+def _connection_not_made(error: Exception) -> bool:
+    """Whether a failed request never reached the server, so resending it can't duplicate it."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    # requests wraps NewConnectionError (refused, DNS failure) in MaxRetryError
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(error, requests.exceptions.ConnectionError) and isinstance(reason, ConnectTimeoutError)
+
+def _retry_after_seconds(headers, attempt: int) -> float:
+    """Seconds to wait from a Retry-After header, else exponential backoff."""
+    try:
+        return float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return min(30.0, 2.0 ** attempt)
+
+# Refresh the Graph token this long before MSAL reports it expiring
+TOKEN_REFRESH_MARGIN = 300
+
+class _GraphAuth(requests.auth.AuthBase):
+    """Attach the current Graph bearer token; on a 401 refresh it and retry once."""
+    
+    def __init__(self, api: 'MicrosoftGraphAPI'):
+        self.api = api
+    
+    def __call__(self, r):
+        r.headers['Authorization'] = f'Bearer {self.api.access_token}'
+        r.register_hook('response', self._handle_401)
+        return r
+    
+    def _handle_401(self, response: requests.Response, **kwargs) -> requests.Response:
+        """Resend a rejected request once with a freshly acquired token."""
+        if response.status_code != 401 or response.history:
+            return response
+        rejected_token = response.request.headers['Authorization'][len('Bearer '):]
+        if not self.api.ensure_token(rejected_token=rejected_token):
+            return response
+        
+        # Drain the rejected response so its connection can be reused
+        response.content
+        response.close()
+        request = response.request.copy()
+        request.headers['Authorization'] = f'Bearer {self.api.access_token}'
+        retry = response.connection.send(request, **kwargs)
+        retry.history.append(response)
+        retry.request = request
+        return retry
+
 class MicrosoftGraphAPI:
     """Handles Microsoft 365 Graph API integration for sending emails and Teams notifications."""
     
@@ -18,23 +151,87 @@ class MicrosoftGraphAPI:
         self.authority = f"https://login.microsoftonline.com/{self.tenant_id}"
         self.scope = ["https://graph.microsoft.com/.default"]
         self.access_token = None
+        self._token_refresh_at = 0.0
+        self._token_lock = threading.Lock()
+        self._auth = _GraphAuth(self)
+        self.token_cache_path = Config.MSAL_TOKEN_CACHE_PATH
+        self._token_cache = None
+        self._app = None
+        # Pooled connections shared by all Graph and webhook calls, sized for
+        # the concurrent batch sends
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=GRAPH_MAX_CONCURRENCY, pool_maxsize=GRAPH_MAX_CONCURRENCY * 2,
+                              max_retries=HTTP_RETRY)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'Content-Type': 'application/json',
+            'User-Agent': 'EffortExpenseSystem/1.0'
+        })
+        # Graph and Teams webhooks throttle independently
+        self.graph_limiter = AdaptiveRateLimiter()
+        self.webhook_limiter = AdaptiveRateLimiter()
         
-    def get_access_token(self) -> Optional[str]:
-        """Get access token for Microsoft Graph API."""
+    def _load_token_cache(self) -> msal.SerializableTokenCache:
+        """Load the persisted MSAL token cache, or start an empty one."""
+        cache = msal.SerializableTokenCache()
+        if self.token_cache_path and os.path.exists(self.token_cache_path):
+            try:
+                with open(self.token_cache_path, 'r') as f:
+                    cache.deserialize(f.read())
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable token cache {self.token_cache_path}: {str(e)}")
+        return cache
+    
+    def _save_token_cache(self) -> None:
+        """Write the token cache back to disk (owner-only) if it changed."""
+        if not self.token_cache_path or not self._token_cache.has_state_changed:
+            return
         try:
-            app = msal.ConfidentialClientApplication(
+            fd = os.open(self.token_cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                f.write(self._token_cache.serialize())
+            self._token_cache.has_state_changed = False
+        except OSError as e:
+            logger.warning(f"Could not persist token cache: {str(e)}")
+    
+    def _post(self, url: str, limiter: AdaptiveRateLimiter, **kwargs) -> requests.Response:
+        """POST through the rate limiter, waiting out and retrying 429s."""
+        for attempt in range(MAX_THROTTLE_RETRIES + 1):
+            limiter.acquire()
+            response = self.session.post(url, **kwargs)
+            if response.status_code != 429:
+                limiter.on_success()
+                return response
+            limiter.on_throttled(_retry_after_seconds(response.headers, attempt))
+        return response
+    
+    def _get_app(self) -> msal.ConfidentialClientApplication:
+        """Get the MSAL client, created once so its token cache is reused."""
+        if self._app is None:
+            self._token_cache = self._load_token_cache()
+            self._app = msal.ConfidentialClientApplication(
                 self.client_id,
                 authority=self.authority,
-                client_credential=self.client_secret
+                client_credential=self.client_secret,
+                token_cache=self._token_cache
             )
-            
-            result = app.acquire_token_silent(self.scope, account=None)
-            if not result:
-                result = app.acquire_token_for_client(scopes=self.scope)
+        return self._app
+    
+    def get_access_token(self) -> Optional[str]:
+        """Get access token for Microsoft Graph API.
+
+        MSAL serves the token from its cache until it is close to expiry, so
+        this is cheap to call before every request.
+        """
+        try:
+            result = self._get_app().acquire_token_for_client(scopes=self.scope)
+            self._save_token_cache()
             
             if "access_token" in result:
                 self.access_token = result["access_token"]
-                logger.info("Successfully obtained access token")
+                self._token_refresh_at = time.monotonic() + result.get("expires_in", 0) - TOKEN_REFRESH_MARGIN
+                if result.get("token_source") != "cache":
+                    logger.info("Successfully obtained access token")
                 return self.access_token
             else:
                 logger.error(f"Failed to obtain access token: {result.get('error_description', 'Unknown error')}")
@@ -44,37 +241,51 @@ class MicrosoftGraphAPI:
             logger.error(f"Error obtaining access token: {str(e)}")
             return None
     
+    def ensure_token(self, rejected_token: Optional[str] = None) -> bool:
+        """Make sure a usable token is held, asking MSAL only when it is near expiry.
+
+        Passing the token Graph rejected forces a refresh, unless another
+        thread has already replaced it.
+        """
+        with self._token_lock:
+            force_refresh = rejected_token is not None and rejected_token == self.access_token
+            if self.access_token and not force_refresh and time.monotonic() < self._token_refresh_at:
+                return True
+            if force_refresh:
+                # Drop the rejected token so MSAL fetches a new one
+                self._get_app().remove_tokens_for_client()
+            return self.get_access_token() is not None
+    
+    @staticmethod
+    def _build_email_data(to_email: str, subject: str, body: str, is_html: bool = True) -> Dict:
+        """Build the sendMail request body for one recipient."""
+        return {
+            "message": {
+                "subject": subject,
+                "body": {
+                    "contentType": "HTML" if is_html else "Text",
+                    "content": body
+                },
+                "toRecipients": [
+                    {
+                        "emailAddress": {
+                            "address": to_email
+                        }
+                    }
+                ]
+            }
+        }
+    
     def send_email(self, to_email: str, subject: str, body: str, is_html: bool = True) -> bool:
         """Send email via Microsoft Graph API."""
-        if not self.access_token:
-            if not self.get_access_token():
-                return False
+        if not self.ensure_token():
+            return False
         
         try:
             url = "https://graph.microsoft.com/v1.0/me/sendMail"
-            headers = {
-                'Authorization': f'Bearer {self.access_token}',
-                'Content-Type': 'application/json'
-            }
+            email_data = self._build_email_data(to_email, subject, body, is_html)
             
-            email_data = {
-                "message": {
-                    "subject": subject,
-                    "body": {
-                        "contentType": "HTML" if is_html else "Text",
-                        "content": body
-                    },
-                    "toRecipients": [
-                        {
-                            "emailAddress": {
-                                "address": to_email
-                            }
-                        }
-                    ]
-                }
-            }
-            
-            response = requests.post(url, headers=headers, json=email_data)
+            response = self._post(url, self.graph_limiter, auth=self._auth, data=json_dumps(email_data))
             
             if response.status_code == 202:
                 logger.info(f"Email sent successfully to {to_email}")
@@ -87,19 +298,103 @@ class MicrosoftGraphAPI:
             logger.error(f"Error sending email: {str(e)}")
             return False
     
+    def send_emails_batch(self, messages: List[Dict]) -> List[bool]:
+        """Send emails through Graph JSON batching, up to 20 per request.
+
+        Each message is a dict of send_email() arguments. Returns one success
+        flag per message; messages Graph certainly didn't send (the batch
+        couldn't connect or was rejected, or the message was throttled) are
+        retried once on their own. Messages whose outcome is unknown (read
+        errors, unreadable responses, 500/504) are reported as failed rather
+        than resent, so nobody gets an email twice. Batches are sent
+        concurrently on a few threads.
+        """
+        if not messages:
+            return []
+        
+        # Acquire the token once up front rather than racing for it per thread
+        self.ensure_token()
+        
+        chunks = [messages[start:start + GRAPH_BATCH_LIMIT]
+                  for start in range(0, len(messages), GRAPH_BATCH_LIMIT)]
+        with ThreadPoolExecutor(max_workers=min(GRAPH_MAX_CONCURRENCY, len(chunks))) as executor:
+            chunk_results = list(executor.map(self._send_email_chunk, chunks))
+        return [sent for chunk_sent in chunk_results for sent in chunk_sent]
+    
+    def _send_email_chunk(self, chunk: List[Dict]) -> List[bool]:
+        """Send one batch of emails, retrying unsent messages individually."""
+        states = self._post_email_batch(chunk)
+        return [
+            self.send_email(**message) if state is None else state
+            for state, message in zip(states, chunk)
+        ]
+    
+    def _post_email_batch(self, chunk: List[Dict]) -> List[Optional[bool]]:
+        """POST one $batch of sendMail requests.
+
+        Returns per message True (sent), False (failed or unknown; must not be
+        resent) or None (certainly not sent; safe to resend).
+        """
+        unsent = [None] * len(chunk)
+        if not self.ensure_token():
+            return unsent
+        
+        try:
+            url = "https://graph.microsoft.com/v1.0/$batch"
+            batch_data = {
+                "requests": [
+                    {
+                        "id": str(i),
+                        "method": "POST",
+                        "url": "/me/sendMail",
+                        "headers": {"Content-Type": "application/json"},
+                        "body": self._build_email_data(**message)
+                    }
+                    for i, message in enumerate(chunk)
+                ]
+            }
+            
+            response = self._post(url, self.graph_limiter, auth=self._auth, data=json_dumps(batch_data))
+        except Exception as e:
+            if _connection_not_made(e):
+                logger.error(f"Could not connect to send email batch: {str(e)}")
+                return unsent
+            # The batch may have been accepted before the connection failed
+            logger.error(f"Error sending email batch, delivery unknown: {str(e)}")
+            return [False] * len(chunk)
+        
+        if response.status_code != 200:
+            logger.error(f"Failed to send email batch: {response.status_code} - {response.text}")
+            return [False] * len(chunk) if response.status_code in AMBIGUOUS_SEND_STATUSES else unsent
+        
+        # Graph accepted the batch; anything not confirmed below is unknown, not unsent
+        states = [False] * len(chunk)
+        try:
+            for item in response.json().get('responses', []):
+                i = int(item['id'])
+                status = item.get('status')
+                if status == 202:
+                    states[i] = True
+                    logger.info(f"Email sent successfully to {chunk[i]['to_email']}")
+                    continue
+                logger.warning(f"Batched email to {chunk[i]['to_email']} failed: {status}")
+                if status == 429:
+                    # Throttled inside the batch; slow every sender down
+                    # before the individual retry
+                    self.graph_limiter.on_throttled(_retry_after_seconds(item.get('headers') or {}, 0))
+                if status not in AMBIGUOUS_SEND_STATUSES:
+                    states[i] = None
+        except Exception as e:
+            logger.error(f"Unreadable email batch response, delivery unknown: {str(e)}")
+        return states
+    
     def send_teams_message(self, channel_id: str, message: str) -> bool:
         """Send message to Teams channel via Microsoft Graph API."""
-        if not self.access_token:
-            if not self.get_access_token():
-                return False
+        if not self.ensure_token():
+            return False
         
         try:
             url = f"https://graph.microsoft.com/v1.0/teams/{channel_id}/channels/{channel_id}/messages"
-            headers = {
-                'Authorization': f'Bearer {self.access_token}',
-                'Content-Type': 'application/json'
-            }
-            
             message_data = {
                 "body": {
                     "contentType": "text",
@@ -107,7 +402,7 @@ class MicrosoftGraphAPI:
                 }
             }
             
-            response = requests.post(url, headers=headers, json=message_data)
+            response = self._post(url, self.graph_limiter, auth=self._auth, data=json_dumps(message_data))
             
             if response.status_code == 201:
                 logger.info(f"Teams message sent successfully to channel {channel_id}")
@@ -123,7 +418,7 @@ class MicrosoftGraphAPI:
     def send_teams_webhook(self, webhook_url: str, message: Dict) -> bool:
         """Send message to Teams via webhook (alternative method)."""
         try:
-            response = requests.post(webhook_url, json=message)
+            response = self._post(webhook_url, self.webhook_limiter, data=json_dumps(message))
             
             if response.status_code == 200:
                 logger.info("Teams webhook message sent successfully")
@@ -136,6 +431,78 @@ class MicrosoftGraphAPI:
             logger.error(f"Error sending Teams webhook: {str(e)}")
             return False
 
+# Email body template, substituted once per notification
+_EMAIL_BODY_TEMPLATE = string.Template("""
+        <html>
+        <head>
+            <style>
+                body { font-family: Arial, sans-serif; margin: 20px; }
+                .header { background-color: #f4f4f4; padding: 15px; border-radius: 5px; }
+                .content { margin: 20px 0; }
+                .details { background-color: #f9f9f9; padding: 15px; border-left: 4px solid #0078d4; }
+                .footer { margin-top: 30px; font-size: 12px; color: #666; }
+                .highlight { color: #d13438; font-weight: bold; }
+            </style>
+        </head>
+        <body>
+            <div class="header">
+                <h2>$title</h2>
+            </div>
+            
+            <div class="content">
+                <p>$description</p>
+                
+                <div class="details">
+                    <h3>Project Details:</h3>
+                    <ul>
+                        <li><strong>Project:</strong> $project_name</li>
+                        <li><strong>Task:</strong> $task_name</li>
+                        <li><strong>Date:</strong> $effort_date</li>
+                        <li><strong>Job Title:</strong> $job_title</li>
+                        <li><strong>Community:</strong> $community</li>
+                    </ul>
+                    
+                    <h3>Effort Expense Information:</h3>
+                    <ul>
+                        <li><strong>Original Value:</strong> <span class="highlight">$original_effort</span></li>
+                        <li><strong>Predicted Value:</strong> $predicted_effort hours</li>
+                        <li><strong>Final Value:</strong> <span class="highlight">$final_effort hours</span></li>
+                    </ul>
+                </div>
+                
+                <p><strong>Action Required:</strong> Please review and update your effort expense data if necessary.</p>
+            </div>
+            
+            <div class="footer">
+                <p>This is an automated notification from the Effort Expense Management System.</p>
+            </div>
+        </body>
+        </html>
+        """)
+
+_MISSING_EMAIL = (
+    "Missing Effort Expense Data",
+    "Your effort expense data is missing for the following entry:"
+)
+_OVER_LIMIT_EMAIL = (
+    "Over-Limit Effort Expense Alert",
+    f"Your effort expense exceeds the limit ({Config.EFFORT_EXPENSE_LIMIT} hours) for the following entry:"
+)
+
+# Static MessageCard fields; all values are strings, so a shallow copy per
+# card is enough
+_TEAMS_CARD_BASE = {
+    "@type": "MessageCard",
+    "@context": "http://schema.org/extensions",
+    "themeColor": "0078D4",
+    "summary": "Effort Expense Alert Summary"
+}
+
+def _has_email_address(addr) -> bool:
+    """Whether a notification's user_email holds an address, not a blank or missing value."""
+    # Missing addresses reach here as None, float NaN or the strings 'NaN'/'nan'
+    return pd.notna(addr) and str(addr).strip() not in ('', 'NaN', 'nan')
+
 class NotificationService:
     """Service for sending notifications about effort expense issues."""
     
@@ -150,44 +517,58 @@ class NotificationService:
             'emails_sent': 0,
             'emails_failed': 0,
             'teams_sent': 0,
-            'teams_failed': 0
+            'teams_failed': 0,
+            'emails_skipped': 0
         }
         
-        # Group notifications by issue type
-        missing_effort = [n for n in notification_data if n['issue_type'] == 'missing']
-        over_limit = [n for n in notification_data if n['issue_type'] == 'over_limit']
-        
-        # Send individual email notifications
-        for notification in notification_data:
-            if notification['user_email'] and notification['user_email'] != 'NaN':
-                email_sent = self._send_individual_email(notification)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Send the Teams summary on its own thread so it overlaps the
+            # email batches instead of waiting for them
+            teams_future = None
+            if teams_webhook_url or teams_channel_id:
+                teams_future = executor.submit(
+                    self._send_teams_summary, notification_data, teams_webhook_url, teams_channel_id
+                )
+            
+            # Send individual email notifications, batched into Graph $batch calls;
+            # entries without an address are counted as skipped, not failed
+            messages = [
+                self._build_email_message(notification)
+                for notification in notification_data
+                if _has_email_address(notification.get('user_email'))
+            ]
+            results['emails_skipped'] = len(notification_data) - len(messages)
+            for email_sent in self.graph_api.send_emails_batch(messages):
                 if email_sent:
                     results['emails_sent'] += 1
                 else:
                     results['emails_failed'] += 1
-        
-        # Send Teams summary notifications
-        if teams_webhook_url or teams_channel_id:
-            teams_sent = self._send_teams_summary(notification_data, teams_webhook_url, teams_channel_id)
-            if teams_sent:
-                results['teams_sent'] += 1
-            else:
-                results['teams_failed'] += 1
+            
+            # Collect the Teams summary result
+            if teams_future is not None:
+                if teams_future.result():
+                    results['teams_sent'] += 1
+                else:
+                    results['teams_failed'] += 1
         
         return results
     
-    def _send_individual_email(self, notification: Dict) -> bool:
-        """Send individual email notification."""
+    def _build_email_message(self, notification: Dict) -> Dict:
+        """Build the send_email() arguments for one notification."""
         subject = f"Effort Expense Alert - {notification['issue_type'].title()}"
         
         body = self._generate_email_body(notification)
         
-        return self.graph_api.send_email(
-            to_email=notification['user_email'],
-            subject=subject,
-            body=body,
-            is_html=True
-        )
+        return {
+            'to_email': notification['user_email'],
+            'subject': subject,
+            'body': body,
+            'is_html': True
+        }
+    
+    def _send_individual_email(self, notification: Dict) -> bool:
+        """Send individual email notification."""
+        return self.graph_api.send_email(**self._build_email_message(notification))
     
     def _send_teams_summary(self, notification_data: List[Dict], 
                            webhook_url: Optional[str] = None,
@@ -204,81 +585,30 @@ class NotificationService:
     
     def _generate_email_body(self, notification: Dict) -> str:
         """Generate HTML email body."""
-        issue_type = notification['issue_type']
-        project_name = notification['project_name']
-        task_name = notification['task_name']
-        effort_date = notification['effort_date']
+        title, description = _MISSING_EMAIL if notification['issue_type'] == 'missing' else _OVER_LIMIT_EMAIL
         original_effort = notification['original_effort']
-        predicted_effort = notification['predicted_effort']
-        final_effort = notification['final_effort']
-        
-        if issue_type == 'missing':
-            title = "Missing Effort Expense Data"
-            description = f"Your effort expense data is missing for the following entry:"
-        else:
-            title = "Over-Limit Effort Expense Alert"
-            description = f"Your effort expense exceeds the limit ({Config.EFFORT_EXPENSE_LIMIT} hours) for the following entry:"
-        
-        html_body = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                .header {{ background-color: #f4f4f4; padding: 15px; border-radius: 5px; }}
-                .content {{ margin: 20px 0; }}
-                .details {{ background-color: #f9f9f9; padding: 15px; border-left: 4px solid #0078d4; }}
-                .footer {{ margin-top: 30px; font-size: 12px; color: #666; }}
-                .highlight {{ color: #d13438; font-weight: bold; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h2>{title}</h2>
-            </div>
-            
-            <div class="content">
-                <p>{description}</p>
-                
-                <div class="details">
-                    <h3>Project Details:</h3>
-                    <ul>
-                        <li><strong>Project:</strong> {project_name}</li>
-                        <li><strong>Task:</strong> {task_name}</li>
-                        <li><strong>Date:</strong> {effort_date}</li>
-                        <li><strong>Job Title:</strong> {notification.get('job_title', 'N/A')}</li>
-                        <li><strong>Community:</strong> {notification.get('community', 'N/A')}</li>
-                    </ul>
-                    
-                    <h3>Effort Expense Information:</h3>
-                    <ul>
-                        <li><strong>Original Value:</strong> <span class="highlight">{original_effort if original_effort is not None else 'Missing'}</span></li>
-                        <li><strong>Predicted Value:</strong> {predicted_effort:.2f} hours</li>
-                        <li><strong>Final Value:</strong> <span class="highlight">{final_effort:.2f} hours</span></li>
-                    </ul>
-                </div>
-                
-                <p><strong>Action Required:</strong> Please review and update your effort expense data if necessary.</p>
-            </div>
-            
-            <div class="footer">
-                <p>This is an automated notification from the Effort Expense Management System.</p>
-            </div>
-        </body>
-        </html>
-        """
         
-        return html_body
+        return _EMAIL_BODY_TEMPLATE.substitute(
+            title=title,
+            description=description,
+            project_name=notification['project_name'],
+            task_name=notification['task_name'],
+            effort_date=notification['effort_date'],
+            job_title=notification.get('job_title', 'N/A'),
+            community=notification.get('community', 'N/A'),
+            original_effort=original_effort if original_effort is not None else 'Missing',
+            predicted_effort=f"{notification['predicted_effort']:.2f}",
+            final_effort=f"{notification['final_effort']:.2f}"
+        )
     
     def _generate_teams_message(self, notification_data: List[Dict]) -> Dict:
         """Generate Teams message card."""
-        missing_count = len([n for n in notification_data if n['issue_type'] == 'missing'])
-        over_limit_count = len([n for n in notification_data if n['issue_type'] == 'over_limit'])
+        issue_counts = Counter(n['issue_type'] for n in notification_data)
+        missing_count = issue_counts['missing']
+        over_limit_count = issue_counts['over_limit']
         
         message = {
-            "@type": "MessageCard",
-            "@context": "http://schema.org/extensions",
-            "themeColor": "0078D4",
-            "summary": "Effort Expense Alert Summary",
+            **_TEAMS_CARD_BASE,
             "sections": [{
                 "activityTitle": "Effort Expense Management Alert",
                 "activitySubtitle": f"Found {len(notification_data)} issues requiring attention",
@@ -293,17 +623,17 @@ class NotificationService:
         
         # Add individual issue details
         if notification_data:
-            issue_details = "\n\n**Issues Details:**\n"
+            parts = ["\n\n**Issues Details:**\n"]
             for i, notification in enumerate(notification_data[:10], 1):  # Limit to first 10
                 issue_type = notification['issue_type'].title()
                 project = notification['project_name']
                 user = notification['user_name']
                 effort = notification['final_effort']
-                issue_details += f"{i}. **{issue_type}** - {project} ({user}): {effort:.2f}h\n"
+                parts.append(f"{i}. **{issue_type}** - {project} ({user}): {effort:.2f}h\n")
             
             if len(notification_data) > 10:
-                issue_details += f"\n... and {len(notification_data) - 10} more issues"
+                parts.append(f"\n... and {len(notification_data) - 10} more issues")
             
-            message["sections"][0]["text"] = issue_details
+            message["sections"][0]["text"] = ''.join(parts)
         
         return message
@@ -6,27 +6,82 @@ Local model storage and management system
 import sqlite3
 import json
 import os
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 import logging
 
 logger = logging.getLogger(__name__)
 
+_INSERT_MODEL_SQL = '''
+    INSERT OR REPLACE INTO models 
+    (model_name, model_type, file_path, metrics, feature_count, 
+     training_samples, effort_limit, is_active, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, 1, CURRENT_TIMESTAMP)
+'''
+
+_MODEL_COLUMNS = (
+    'id, model_name, model_type, file_path, created_at, updated_at, metrics, '
+    'feature_count, training_samples, effort_limit, is_active'
+)
+# Rows fetched per round trip when listing models
+_FETCH_SIZE = 256
+
+def _row_to_model(row: sqlite3.Row) -> Dict[str, Any]:
+    """Convert a models table row into a metadata dict."""
+    model = dict(zip(row.keys(), row))
+    model['metrics'] = json.loads(model['metrics']) if model['metrics'] else {}
+    model['is_active'] = bool(model['is_active'])
+    return model
+
+# One ModelStorage per database path, shared by every DataProcessor so each
+# doesn't hold its own connection open; keyed on the absolute path
+_shared_storages: Dict[str, 'ModelStorage'] = {}
+_shared_lock = threading.Lock()
+
+def get_model_storage(db_path: str = "models.db") -> 'ModelStorage':
+    """The shared ModelStorage for a database path, opened on first use."""
+    key = os.path.abspath(db_path)
+    with _shared_lock:
+        storage = _shared_storages.get(key)
+        if storage is None:
+            storage = _shared_storages[key] = ModelStorage(db_path)
+        return storage
+
 class ModelStorage:
     """Local database storage for ML models and metadata."""
     
     def __init__(self, db_path: str = "models.db"):
         """Initialize the model storage database."""
         self.db_path = db_path
+        # One long-lived autocommit connection shared by all callers; the
+        # lock serialises access since Streamlit may call from several threads
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA temp_store=MEMORY')
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
         self.init_database()
     
+    def close(self):
+        """Close the database connection; get_model_storage opens a new one afterwards."""
+        with _shared_lock:
+            if _shared_storages.get(os.path.abspath(self.db_path)) is self:
+                del _shared_storages[os.path.abspath(self.db_path)]
+        with self._lock:
+            self._conn.close()
+    
     def init_database(self):
         """Initialize the SQLite database for model storage."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        with self._lock:
+            self._create_tables()
+        logger.info("Model storage database initialized")
+    
+    def _create_tables(self):
+        """Create the models and model_versions tables if missing."""
         # Create models table
-        cursor.execute('''
+        self._conn.execute('''
             CREATE TABLE IF NOT EXISTS models (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 model_name TEXT UNIQUE NOT NULL,
@@ -43,7 +98,7 @@ class ModelStorage:
         ''')
         
         # Create model versions table for tracking
-        cursor.execute('''
+        self._conn.execute('''
             CREATE TABLE IF NOT EXISTS model_versions (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 model_id INTEGER,
@@ -55,145 +110,119 @@ class ModelStorage:
             )
         ''')
         
-        conn.commit()
-        conn.close()
-        logger.info("Model storage database initialized")
+        # Index the active-model lookup and the newest-first listings
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_models_active_updated ON models (is_active, updated_at DESC)'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_models_updated ON models (updated_at DESC)'
+        )
+        # Refresh planner statistics only when SQLite thinks they are stale
+        self._conn.execute('PRAGMA optimize')
     
     def save_model(self, model_name: str, model_type: str, file_path: str, 
                    metrics: Dict[str, Any], feature_count: int, 
                    training_samples: int, effort_limit: float) -> int:
         """Save model metadata to database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Deactivate all existing models
-        cursor.execute('UPDATE models SET is_active = 0')
-        
-        # Insert new model
-        cursor.execute('''
-            INSERT OR REPLACE INTO models 
-            (model_name, model_type, file_path, metrics, feature_count, 
-             training_samples, effort_limit, is_active, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, 1, CURRENT_TIMESTAMP)
-        ''', (
-            model_name, model_type, file_path, json.dumps(metrics),
-            feature_count, training_samples, effort_limit
-        ))
-        
-        model_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self._lock:
+            # Take the write lock up front so other connections never see
+            # the window where every model is inactive
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                # Deactivate the previously active model(s)
+                self._conn.execute('UPDATE models SET is_active = 0 WHERE is_active = 1')
+                
+                # Insert new model
+                cursor = self._conn.execute(_INSERT_MODEL_SQL, (
+                    model_name, model_type, file_path, json.dumps(metrics),
+                    feature_count, training_samples, effort_limit
+                ))
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+            model_id = cursor.lastrowid
         
         logger.info(f"Model saved to database: {model_name}")
         return model_id
     
     def get_active_model(self) -> Optional[Dict[str, Any]]:
         """Get the currently active model."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM models WHERE is_active = 1 ORDER BY updated_at DESC LIMIT 1
-        ''')
-        
-        row = cursor.fetchone()
-        conn.close()
+        with self._lock:
+            row = self._conn.execute(
+                f'SELECT {_MODEL_COLUMNS} FROM models WHERE is_active = 1 ORDER BY updated_at DESC LIMIT 1'
+            ).fetchone()
         
         if row:
-            return {
-                'id': row[0],
-                'model_name': row[1],
-                'model_type': row[2],
-                'file_path': row[3],
-                'created_at': row[4],
-                'updated_at': row[5],
-                'metrics': json.loads(row[6]) if row[6] else {},
-                'feature_count': row[7],
-                'training_samples': row[8],
-                'effort_limit': row[9],
-                'is_active': bool(row[10])
-            }
+            return _row_to_model(row)
         return None
     
     def get_all_models(self) -> List[Dict[str, Any]]:
         """Get all saved models."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM models ORDER BY updated_at DESC
-        ''')
+        models = []
+        with self._lock:
+            cursor = self._conn.execute(f'SELECT {_MODEL_COLUMNS} FROM models ORDER BY updated_at DESC')
+            while True:
+                rows = cursor.fetchmany(_FETCH_SIZE)
+                if not rows:
+                    break
+                models.extend(_row_to_model(row) for row in rows)
         
-        rows = cursor.fetchall()
-        conn.close()
+        return models
+    
+    def list_models_lightweight(self) -> List[Dict[str, Any]]:
+        """List saved models without decoding their metrics, for list views."""
+        with self._lock:
+            rows = self._conn.execute('''
+                SELECT id, model_name, model_type, created_at, updated_at, is_active,
+                       COALESCE(metrics NOT IN ('', '{}'), 0) AS has_metrics
+                FROM models ORDER BY updated_at DESC
+            ''').fetchall()
         
         models = []
         for row in rows:
-            models.append({
-                'id': row[0],
-                'model_name': row[1],
-                'model_type': row[2],
-                'file_path': row[3],
-                'created_at': row[4],
-                'updated_at': row[5],
-                'metrics': json.loads(row[6]) if row[6] else {},
-                'feature_count': row[7],
-                'training_samples': row[8],
-                'effort_limit': row[9],
-                'is_active': bool(row[10])
-            })
-        
+            model = dict(zip(row.keys(), row))
+            model['is_active'] = bool(model['is_active'])
+            model['has_metrics'] = bool(model['has_metrics'])
+            models.append(model)
         return models
     
     def delete_model(self, model_id: int) -> bool:
         """Delete a model from database and file system."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get model info
-        cursor.execute('SELECT file_path FROM models WHERE id = ?', (model_id,))
-        row = cursor.fetchone()
+        with self._lock:
+            # Get model info
+            row = self._conn.execute('SELECT file_path FROM models WHERE id = ?', (model_id,)).fetchone()
+            
+            if row:
+                # Delete from database
+                self._conn.execute('DELETE FROM models WHERE id = ?', (model_id,))
         
         if row:
             file_path = row[0]
             
-            # Delete from database
-            cursor.execute('DELETE FROM models WHERE id = ?', (model_id,))
-            conn.commit()
-            conn.close()
-            
-            # Delete file if exists
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                logger.info(f"Model file deleted: {file_path}")
+            # Delete the model file and its native CatBoost file if they exist
+            for path in (file_path, os.path.splitext(file_path)[0] + '.cbm'):
+                if os.path.exists(path):
+                    os.remove(path)
+                    logger.info(f"Model file deleted: {path}")
             
             logger.info(f"Model deleted from database: ID {model_id}")
             return True
         
-        conn.close()
         return False
     
     def get_model_stats(self) -> Dict[str, Any]:
         """Get model storage statistics."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Count total models
-        cursor.execute('SELECT COUNT(*) FROM models')
-        total_models = cursor.fetchone()[0]
-        
-        # Count active models
-        cursor.execute('SELECT COUNT(*) FROM models WHERE is_active = 1')
-        active_models = cursor.fetchone()[0]
-        
-        # Get latest model info
-        cursor.execute('''
-            SELECT model_type, updated_at FROM models 
-            ORDER BY updated_at DESC LIMIT 1
-        ''')
-        latest = cursor.fetchone()
-        
-        conn.close()
+        with self._lock:
+            # Count total and active models in one scan
+            total_models, active_models = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(is_active = 1), 0) FROM models'
+            ).fetchone()
+            
+            # Get latest model info
+            latest = self._conn.execute(
+                'SELECT model_type, updated_at FROM models ORDER BY updated_at DESC LIMIT 1'
+            ).fetchone()
         
         return {
             'total_models': total_models,
@@ -1,33 +1,84 @@
 import requests
-import json
+import gzip
 import logging
-from typing import Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, List, Optional, Union
 from config import Config
+from json_utils import json_dumps
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Retry throttled (429), 502/503 responses and failed connects with
+# exponential backoff, honouring Retry-After; other errors fail straight away.
+# Read errors, dropped connections, 500 and 504 are not retried, since n8n
+# may already have started the workflow for the POST
+HTTP_RETRY = Retry(
+    total=5,
+    read=0,
+    other=0,
+    backoff_factor=1.0,
+    status_forcelist=[429, 502, 503],
+    allowed_methods=['POST'],
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+
+# Gzip webhook bodies larger than this; smaller ones aren't worth the CPU
+GZIP_MIN_BYTES = 16 * 1024
+GZIP_LEVEL = 3
+
+# Background senders for fire-and-forget webhook POSTs, shared by all clients;
+# pending sends are flushed when the interpreter exits
+_SEND_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='n8n-webhook')
+
+# Stand-in for a DataFrame in a payload; replaced by the frame's own JSON
+_FRAME_PLACEHOLDER = '__n8n_frame_records__'
+
+def _workflow_body(payload: Dict, frame) -> bytes:
+    """Serialise a payload whose frame slot holds _FRAME_PLACEHOLDER.
+
+    The frame is written as a records array by DataFrame.to_json, so its rows
+    never become Python dicts.
+    """
+    records = frame.to_json(orient='records', date_format='iso').encode('utf-8')
+    return json_dumps(payload).replace(
+        b'"' + _FRAME_PLACEHOLDER.encode('ascii') + b'"', records, 1)
+
 class N8NWebhookClient:
     """Client for sending data to n8n webhooks."""
     
     def __init__(self, webhook_url: Optional[str] = None):
         self.webhook_url = webhook_url or Config.N8N_WEBHOOK_URL
         self.session = requests.Session()
+        adapter = HTTPAdapter(max_retries=HTTP_RETRY)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.session.headers.update({
             'Content-Type': 'application/json',
             'User-Agent': 'EffortExpenseSystem/1.0'
         })
     
-    def send_effort_expense_data(self, data: Dict) -> bool:
-        """Send effort expense data to n8n webhook."""
+    def send_effort_expense_data(self, data: Union[Dict, bytes]) -> bool:
+        """Send effort expense data (a payload or an encoded JSON body) to n8n webhook."""
         if not self.webhook_url:
             logger.warning("No n8n webhook URL configured")
             return False
         
         try:
+            body = data if isinstance(data, bytes) else json_dumps(data)
+            headers = {}
+            if len(body) >= GZIP_MIN_BYTES:
+                body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+                headers['Content-Encoding'] = 'gzip'
+            
             response = self.session.post(
                 self.webhook_url,
-                json=data,
+                data=body,
+                headers=headers,
                 timeout=30
             )
             
@@ -45,6 +96,10 @@ class N8NWebhookClient:
             logger.error(f"Unexpected error sending data to n8n webhook: {str(e)}")
             return False
     
+    def send_effort_expense_data_async(self, data: Union[Dict, bytes]) -> Future:
+        """Send effort expense data in the background; the future resolves to the send result."""
+        return _SEND_POOL.submit(self.send_effort_expense_data, data)
+    
     def send_notification_request(self, notification_data: List[Dict], 
                                 summary: Dict, 
                                 notification_type: str = "effort_expense_alert") -> bool:
@@ -85,7 +140,6 @@ class N8NWebhookClient:
     
     def _get_current_timestamp(self) -> str:
         """Get current timestamp in ISO format."""
-        from datetime import datetime
         return datetime.now().isoformat()
 
 class N8NWorkflowManager:
@@ -95,12 +149,35 @@ class N8NWorkflowManager:
         self.webhook_client = N8NWebhookClient(webhook_url)
     
     def trigger_effort_expense_workflow(self, 
-                                      processed_data: Dict,
+                                      processed_data,
                                       issues: Dict,
                                       notification_data: List[Dict]) -> bool:
         """Trigger the complete effort expense workflow in n8n."""
+        workflow_data = self._build_workflow_data(processed_data, issues, notification_data)
+        return self.webhook_client.send_effort_expense_data(workflow_data)
+    
+    def trigger_effort_expense_workflow_async(self, 
+                                            processed_data,
+                                            issues: Dict,
+                                            notification_data: List[Dict]) -> Future:
+        """Trigger the effort expense workflow without waiting for n8n to respond."""
+        workflow_data = self._build_workflow_data(processed_data, issues, notification_data)
+        return self.webhook_client.send_effort_expense_data_async(workflow_data)
+    
+    def _build_workflow_data(self, 
+                            processed_data,
+                            issues: Dict,
+                            notification_data: List[Dict]) -> Union[Dict, bytes]:
+        """Build the workflow trigger payload.
+
+        ``processed_data`` may be a DataFrame, which is encoded straight into
+        the JSON body (as a list of row records) instead of a payload dict.
+        """
+        frame = processed_data if hasattr(processed_data, 'to_json') else None
+        if frame is not None:
+            processed_data = _FRAME_PLACEHOLDER
         
-        workflow_data = {
+        payload = {
             "workflow_type": "effort_expense_processing",
             "data": {
                 "processed_data": processed_data,
@@ -119,8 +196,7 @@ class N8NWorkflowManager:
                 "notification_priority": "high"
             }
         }
-        
-        return self.webhook_client.send_effort_expense_data(workflow_data)
+        return payload if frame is None else _workflow_body(payload, frame)
     
     def send_batch_notifications(self, 
                                batch_data: List[Dict],
@@ -143,7 +219,6 @@ class N8NWorkflowManager:
     
     def _get_current_timestamp(self) -> str:
         """Get current timestamp in ISO format."""
-        from datetime import datetime
         return datetime.now().isoformat()
 
 # Example n8n workflow configuration
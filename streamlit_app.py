@@ -1,15 +1,32 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime
+from pandas.api.types import union_categoricals
+from datetime import date, datetime
+import hashlib
+import importlib.util
 import io
-import json
+import logging
+import math
+import os
+import re
+import zipfile
 
 from data_processor import DataProcessor
-from microsoft_integration import NotificationService
-from n8n_integration import N8NWorkflowManager
 from config import Config
+from json_utils import json_dumps
+
+logger = logging.getLogger(__name__)
+
+# plotly.express (~200 ms) and the Microsoft 365 / n8n clients (msal, ~130 ms)
+# are imported where they are used so the first page renders sooner
+
+# Write Excel reports with xlsxwriter when it is installed (faster, and
+# flushes rows as they are written); the openpyxl write-only writer otherwise
+_HAS_XLSXWRITER = importlib.util.find_spec('xlsxwriter') is not None
+
+# Offer Parquet export when pyarrow is installed
+_HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
 
 # Page configuration
 st.set_page_config(
@@ -19,8 +36,19 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Tabs that only read the processed data rerun on their own when their widgets
+# change (st.fragment, Streamlit 1.37+; plain functions on older releases)
+_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', lambda func: func)
+
+def _minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace from a <style> block."""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    return css.replace(';}', '}').strip()
+
 # Custom CSS
-st.markdown("""
+_HEADER_CSS = _minify_css("""
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -56,7 +84,12 @@ st.markdown("""
         margin: 1rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+""")
+
+def _show_chart(fig, key: str):
+    """Render a Plotly chart under a stable key, keeping zoom/pan across reruns."""
+    fig.update_layout(uirevision=key)
+    st.plotly_chart(fig, use_container_width=True, key=key)
 
 def advanced_data_viewer(df: pd.DataFrame, key_suffix: str = "", height: int = 400, num_rows: int = None):
     """
@@ -149,15 +182,120 @@ def advanced_data_viewer(df: pd.DataFrame, key_suffix: str = "", height: int = 4
     
     return edited_df
 
+@st.cache_resource(show_spinner=False)
+def _sidebar_logo() -> bytes:
+    """Read the sidebar logo once per process."""
+    with open("assests/image.png", "rb") as f:
+        return f.read()
+
+@st.cache_resource(show_spinner=False)
+def get_processor(effort_limit: int, missing_threshold: float) -> DataProcessor:
+    """Get the shared DataProcessor for these settings, with the active model loaded if there is one.
+
+    The processor is shared by every session, so it is only loaded from and
+    predicted with, never trained; clear the cache after saving a model.
+    """
+    processor = DataProcessor(effort_limit=effort_limit, missing_threshold=missing_threshold)
+    try:
+        processor.load_model()  # This will load from database
+    except Exception:
+        # No saved model yet; training will provide one
+        pass
+    return processor
+
+@st.cache_resource(show_spinner=False)
+def _get_notification_service():
+    """Share one NotificationService, with its Graph session and token, across sends."""
+    from microsoft_integration import NotificationService
+    return NotificationService()
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _get_n8n_manager(webhook_url: str):
+    """Share one N8NWorkflowManager and its HTTP session per webhook URL."""
+    from n8n_integration import N8NWorkflowManager
+    return N8NWorkflowManager(webhook_url)
+
+# Keep only a few recent uploads in memory; parsed frames can be large
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_and_preprocess(file_bytes: bytes, file_name: str, effort_limit: int,
+                        missing_threshold: float):
+    """Parse and preprocess an uploaded file, cached on its contents and the settings."""
+    processor = get_processor(effort_limit, missing_threshold)
+    file_input = io.BytesIO(file_bytes)
+    file_input.name = file_name  # load_data picks the reader from the suffix
+    df = processor.load_data(file_input)
+    return df, processor.preprocess_data(df)
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _load_processor(model_file: str, mtime: float, effort_limit: int,
+                    missing_threshold: float) -> DataProcessor:
+    """Load a model file into a processor once; mtime invalidates it when the file changes."""
+    processor = DataProcessor(effort_limit=effort_limit, missing_threshold=missing_threshold)
+    processor.load_model(model_file)
+    return processor
+
+# Rescanned only when the working directory's mtime changes (a file was
+# added, removed or renamed); saving a model also clears it, for
+# filesystems with coarse mtimes
+@st.cache_data(show_spinner=False, max_entries=1)
+def _scan_model_files(dir_mtime_ns: int) -> list:
+    """List the saved model files in the working directory."""
+    with os.scandir('.') as entries:
+        return sorted(entry.name for entry in entries
+                      if entry.name.startswith('effort_expense_model_') and entry.name.endswith('.pkl')
+                      and entry.is_file())
+
+def _saved_model_files() -> list:
+    """Saved model files in the working directory, from the last scan while it is unchanged."""
+    return _scan_model_files(os.stat('.').st_mtime_ns)
+
+def _hash_frame(df: pd.DataFrame) -> bytes:
+    """Hash a frame's column names, dtypes and every row, index included, for st.cache_data keys."""
+    # Row hashes alone miss renamed columns and dtype-only casts
+    digest = hashlib.blake2b(repr((tuple(df.columns), tuple(map(str, df.dtypes)))).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.digest()
+
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs={pd.DataFrame: _hash_frame})
+def _predict_bundle(_processor: DataProcessor, df_processed: pd.DataFrame, model_version: int):
+    """Run prediction, issue detection, summary and notification prep for one model and frame."""
+    df_predicted = _processor.predict_effort_expenses(df_processed)
+    issues, summary, notification_data = _processor.postprocess(df_predicted)
+    return df_predicted, issues, summary, notification_data
+
+# Training is seeded, so the same frame and settings give the same model;
+# repeat comparisons reuse the fit instead of retraining
+@st.cache_resource(show_spinner=False, max_entries=2, hash_funcs={pd.DataFrame: _hash_frame})
+def _train_comparison_model(df_processed: pd.DataFrame, effort_limit: int, missing_threshold: float):
+    """Train a fresh CatBoost processor on a frame, once per frame contents and settings."""
+    processor = DataProcessor(effort_limit=effort_limit, missing_threshold=missing_threshold)
+    metrics = processor.train_model(df_processed, hyperparameter_tuning=False)
+    return processor, metrics
+
+# Plotly Express figures are cached as JSON on their data and options, so
+# reruns with unchanged data skip the figure construction
+@st.cache_data(show_spinner=False, max_entries=32, hash_funcs={pd.DataFrame: _hash_frame})
+def _px_figure_json(kind: str, data: pd.DataFrame, layout: dict = None, **kwargs) -> str:
+    """Build a Plotly Express figure once per chart type, data and options, as figure JSON."""
+    import plotly.express as px
+    fig = getattr(px, kind)(data, **kwargs)
+    if layout:
+        fig.update_layout(**layout)
+    return fig.to_json()
+
+def _show_px_chart(kind: str, data: pd.DataFrame, key: str, layout: dict = None, **kwargs):
+    """Render a cached Plotly Express chart (px.<kind>) through _show_chart."""
+    import plotly.io as pio
+    _show_chart(pio.from_json(_px_figure_json(kind, data, layout, **kwargs)), key)
+
 def auto_load_saved_model():
     """Automatically load the most recent saved model if available."""
     if 'processor' not in st.session_state:
         try:
-            # Initialize processor
-            processor = DataProcessor()
-            
-            # Try to load the most recent active model from database
-            processor.load_model()  # This will load from database
+            # Reuse the cached processor and its model from the database
+            processor = get_processor(Config.EFFORT_EXPENSE_LIMIT, Config.MISSING_VALUE_THRESHOLD)
+            if not processor.is_model_trained:
+                raise ValueError("No active model found in database")
             
             # Store in session state
             st.session_state['processor'] = processor
@@ -172,11 +310,8 @@ def auto_load_saved_model():
             # No model available, that's okay
             pass
 
-def main():
-    """Main Streamlit application."""
-    
-    # Custom CSS for msg global theme
-    st.markdown("""
+# Theme CSS injected at the top of every main() run
+_MAIN_CSS = _minify_css("""
     <style>
     /* Import Google Fonts for professional typography */
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
@@ -395,11 +530,6 @@ def main():
         padding: 1rem !important;
     }
     
-    .stAlert[data-testid="stAlert"] {
-        border-left: 4px solid #28a745 !important;
-        background-color: #f8f9fa !important;
-    }
-    
     /* Error styling */
     .stAlert[data-testid="stAlert"] {
         border-left: 4px solid #dc3545 !important;
@@ -564,26 +694,6 @@ def main():
         font-family: 'Inter', 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif !important;
     }
     
-    /* Remove default Streamlit styling that causes issues */
-    .stApp > header {
-        background-color: var(--msg-white) !important;
-    }
-    
-    .stApp > header .css-1v0mbdj {
-        background-color: var(--msg-white) !important;
-    }
-    
-    /* Fix any remaining dark mode elements */
-    .css-1v0mbdj, .css-1d391kg, .css-1v0mbdj {
-        background-color: var(--msg-white) !important;
-        color: var(--msg-text-dark) !important;
-    }
-    
-    /* Ensure all text is visible */
-    .stApp * {
-        color: inherit !important;
-    }
-    
     /* Fix hover states */
     .stButton > button:focus {
         outline: 2px solid var(--msg-red) !important;
@@ -654,11 +764,6 @@ def main():
         color: var(--msg-text-dark) !important;
     }
     
-    /* Force header background to white */
-    .stApp header {
-        background-color: var(--msg-white) !important;
-    }
-    
     .stApp header .css-1v0mbdj {
         background-color: var(--msg-white) !important;
     }
@@ -668,13 +773,6 @@ def main():
         background-color: var(--msg-white) !important;
     }
     
-    /* Style the sidebar toggle button */
-    .stApp header button[data-testid="stSidebarToggle"] {
-        background-color: var(--msg-white) !important;
-        color: var(--msg-text-dark) !important;
-        border: 1px solid var(--msg-border) !important;
-    }
-    
     /* Simple sidebar toggle button styling */
     .stApp header button[data-testid="stSidebarToggle"] {
         background: var(--msg-white) !important;
@@ -772,7 +870,24 @@ def main():
         font-size: 14px !important;
     }
     </style>
-    """, unsafe_allow_html=True)
+    """)
+
+def _inject_css(css: str):
+    """Emit the app styles as one element.
+
+    st.html (Streamlit 1.36+) hands style-only HTML straight to the page
+    without running it through the markdown renderer on every rerun.
+    """
+    if hasattr(st, 'html'):
+        st.html(css)
+    else:
+        st.markdown(css, unsafe_allow_html=True)
+
+def main():
+    """Main Streamlit application."""
+    
+    # Custom CSS for msg global theme
+    _inject_css(_HEADER_CSS + _MAIN_CSS)
     
     
 
@@ -793,7 +908,7 @@ def main():
     with st.sidebar:
         # Sidebar logo
         try:
-            st.image("assests/image.png", width=120)
+            st.image(_sidebar_logo(), width=120)
         except:
             # Fallback to text logo if image not found
             st.markdown("""
@@ -833,36 +948,63 @@ def main():
         st.subheader("📧 Notification Settings")
         send_emails = st.checkbox("Send Email Notifications", value=True)
         send_teams = st.checkbox("Send Teams Notifications", value=True)
+        # Seed the text inputs from Config once per session; afterwards the
+        # widgets read their state by key
+        for key, default in (('n8n_webhook', Config.N8N_WEBHOOK_URL), ('tenant_id', Config.TENANT_ID),
+                             ('client_id', Config.CLIENT_ID), ('client_secret', Config.CLIENT_SECRET)):
+            st.session_state.setdefault(key, default or "")
         n8n_webhook = st.text_input(
             "n8n Webhook URL",
-            value=Config.N8N_WEBHOOK_URL or "",
+            key="n8n_webhook",
             help="URL for n8n webhook integration"
         )
         
         # Microsoft 365 settings
         st.subheader("🔐 Microsoft 365 Settings")
-        tenant_id = st.text_input("Tenant ID", value=Config.TENANT_ID or "", type="password")
-        client_id = st.text_input("Client ID", value=Config.CLIENT_ID or "", type="password")
-        client_secret = st.text_input("Client Secret", value=Config.CLIENT_SECRET or "", type="password")
-    
-    # Main content area
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["Upload & Train", "Analysis", "Notifications", "Model Management", "Reports"])
+        # Submitted together so editing credentials doesn't rerun the app per field
+        with st.form("ms365"):
+            tenant_id = st.text_input("Tenant ID", key="tenant_id", type="password")
+            client_id = st.text_input("Client ID", key="client_id", type="password")
+            client_secret = st.text_input("Client Secret", key="client_secret", type="password")
+            st.form_submit_button("Save")
+    
+    # Main content area; only the selected section runs, unlike st.tabs which
+    # executes every tab body on each rerun
+    section = st.radio(
+        "Section",
+        ["Upload & Train", "Analysis", "Notifications", "Model Management", "Reports"],
+        horizontal=True,
+        label_visibility="collapsed",
+        key="active_section"
+    )
     
-    with tab1:
+    if section == "Upload & Train":
         upload_data_tab(effort_limit, missing_threshold)
-    
-    with tab2:
+    elif section == "Analysis":
         analysis_tab()
-    
-    with tab3:
+    elif section == "Notifications":
         notifications_tab(send_emails, send_teams, n8n_webhook)
-    
-    with tab4:
+    elif section == "Model Management":
         model_management_tab()
-    
-    with tab5:
+    else:
         reports_tab()
 
+# Columns shown in the prediction preview, with updUserOid displayed as userid
+_PREVIEW_COLUMNS = ['effortDate', 'updUserOid', 'effortExpense_original', 'effortExpense_predicted',
+                    'effortExpense_final', 'is_missing_effort', 'is_over_limit']
+
+def _prediction_previews(df_predicted: pd.DataFrame):
+    """Return the predicted rows and the first 10 rows, limited to the preview columns.
+
+    Rows and columns are selected together, so only the rows being shown are
+    copied, and only those small frames are renamed.
+    """
+    columns = [col for col in _PREVIEW_COLUMNS if col in df_predicted.columns]
+    predicted_rows = df_predicted.loc[df_predicted['needs_prediction'].to_numpy(), columns]
+    first_rows = df_predicted.iloc[:10][columns]
+    rename = {'updUserOid': 'userid'}
+    return predicted_rows.rename(columns=rename), first_rows.rename(columns=rename)
+
 def upload_data_tab(effort_limit: int, missing_threshold: float):
     """File upload and ML model training tab."""
     st.header("Upload Data & Train ML Model")
@@ -902,20 +1044,19 @@ def upload_data_tab(effort_limit: int, missing_threshold: float):
     
     if uploaded_file is not None:
         try:
-            # Initialize data processor
-            processor = DataProcessor(
-                effort_limit=effort_limit, 
-                missing_threshold=missing_threshold
-            )
+            # Get the cached data processor for the current settings
+            processor = get_processor(effort_limit, missing_threshold)
             
             # Load data
             with st.spinner("Loading data..."):
-                df = processor.load_data(uploaded_file)
-                df_processed = processor.preprocess_data(df)
+                df, df_processed = load_and_preprocess(
+                    uploaded_file.getvalue(), uploaded_file.name, effort_limit, missing_threshold
+                )
             
             # Check if we have enough data for training
-            available_data = df_processed.dropna(subset=['effortExpense'])
-            if len(available_data) < 10:
+            has_effort = df_processed['effortExpense'].notna().to_numpy()
+            n_train = int(has_effort.sum())
+            if n_train < 10:
                 st.error("Not enough data for training. Need at least 10 rows with effort expense values.")
                 return
             
@@ -925,9 +1066,9 @@ def upload_data_tab(effort_limit: int, missing_threshold: float):
             with col1:
                 st.metric("Total Rows", len(df_processed))
             with col2:
-                st.metric("Training Data", len(available_data))
+                st.metric("Training Data", n_train)
             with col3:
-                st.metric("Missing Values", df_processed['effortExpense'].isna().sum())
+                st.metric("Missing Values", has_effort.size - n_train)
             
             # Model options
             st.subheader("Model Options")
@@ -939,15 +1080,23 @@ def upload_data_tab(effort_limit: int, missing_threshold: float):
             
             # Show available saved models from database
             try:
-                saved_models = processor.get_saved_models()
+                saved_models = processor.list_saved_models()
                 if saved_models:
                     st.write("**Available Saved Models:**")
-                    for model in saved_models:
-                        status = "🟢 Active" if model['is_active'] else "⚪ Inactive"
-                        st.write(f"  - **{model['model_name']}** ({model['model_type']}) - {status}")
-                        st.write(f"    Created: {model['created_at']}")
-                        if model['metrics']:
-                            st.write(f"    Model trained successfully")
+                    # One virtualized table for the whole list
+                    models_df = pd.DataFrame(saved_models)
+                    models_df['status'] = models_df['is_active'].map({True: "🟢 Active", False: "⚪ Inactive"})
+                    st.dataframe(
+                        models_df[['model_name', 'model_type', 'status', 'created_at', 'has_metrics']].rename(columns={
+                            'model_name': 'Model',
+                            'model_type': 'Type',
+                            'status': 'Status',
+                            'created_at': 'Created',
+                            'has_metrics': 'Trained'
+                        }),
+                        hide_index=True,
+                        use_container_width=True
+                    )
                 else:
                     st.write("**No saved models found in database.**")
             except Exception as e:
@@ -959,43 +1108,35 @@ def upload_data_tab(effort_limit: int, missing_threshold: float):
             
             with col1:
                 if st.button("Train New Model", type="primary", use_container_width=True):
-                    # Create progress bar
-                    progress_bar = st.progress(0)
-                    status_text = st.empty()
+                    # Create progress bar; its text doubles as the status line, so
+                    # each milestone is a single update
+                    progress_bar = st.progress(0, text="Initializing model training...")
                     
                     try:
-                        status_text.text("Initializing model training...")
-                        progress_bar.progress(10)
-                        
                         # Train new model
                         if fast_mode:
-                            status_text.text("Training CatBoost model in fast mode (10-30 seconds)...")
+                            progress_bar.progress(30, text="Training CatBoost model in fast mode (10-30 seconds)...")
                         else:
-                            status_text.text("Training CatBoost model (30-60 seconds)...")
-                        progress_bar.progress(30)
+                            progress_bar.progress(30, text="Training CatBoost model (30-60 seconds)...")
                         
+                        # Train a processor of this session's own; the cached
+                        # get_processor one is shared by every session, so it is
+                        # only ever loaded from, never retrained
+                        processor = DataProcessor(effort_limit=effort_limit, missing_threshold=missing_threshold)
                         metrics = processor.train_model(df_processed, hyperparameter_tuning=hyperparameter_tuning, fast_mode=fast_mode)
                         
-                        progress_bar.progress(70)
-                        status_text.text("Model training completed! Making predictions...")
-                        
                         # Store in session state
                         st.session_state['processor'] = processor
                         st.session_state['model_loaded'] = True
                         st.session_state['loaded_model_type'] = 'catboost'
                         st.session_state['loaded_model_file'] = "effort_expense_model_catboost.pkl"
                         
-                        progress_bar.progress(80)
-                        status_text.text("Making predictions on data...")
+                        progress_bar.progress(80, text="Model training completed! Making predictions...")
                         
                         # Make predictions
-                        df_predicted = processor.predict_effort_expenses(df_processed)
-                        issues = processor.identify_issues(df_predicted)
-                        summary = processor.generate_summary_report(df_predicted, issues)
-                        notification_data = processor.prepare_notification_data(df_predicted, issues)
-                        
-                        progress_bar.progress(90)
-                        status_text.text("Finalizing results...")
+                        df_predicted, issues, summary, notification_data = _predict_bundle(
+                            processor, df_processed, processor.model_version
+                        )
                         
                         # Store in session state
                         st.session_state['df_original'] = df
@@ -1006,8 +1147,7 @@ def upload_data_tab(effort_limit: int, missing_threshold: float):
                         st.session_state['processor'] = processor
                         st.session_state['model_metrics'] = metrics
                         
-                        progress_bar.progress(100)
-                        status_text.text("Training completed successfully!")
+                        progress_bar.progress(100, text="Training completed successfully!")
                         
                         st.success("New model trained successfully!")
                         
@@ -1018,13 +1158,11 @@ def upload_data_tab(effort_limit: int, missing_threshold: float):
                         # Feature importance
                         if 'feature_importance' in metrics and metrics['feature_importance']:
                             st.subheader("Feature Importance")
-                            importance_df = pd.DataFrame(
-                                list(metrics['feature_importance'].items()),
-                                columns=['Feature', 'Importance']
-                            ).sort_values('Importance', ascending=True)
+                            importance_df = processor.feature_importance_df
                             
+                            import plotly.express as px
                             fig = px.bar(
-                                importance_df, 
+                                importance_df.iloc[::-1], 
                                 x='Importance', 
                                 y='Feature',
                                 orientation='h',
@@ -1033,11 +1171,14 @@ def upload_data_tab(effort_limit: int, missing_threshold: float):
                                 color_continuous_scale='viridis'
                             )
                             fig.update_layout(height=400)
-                            st.plotly_chart(fig, use_container_width=True, key="feature_importance_new")
+                            _show_chart(fig, "feature_importance_new")
                         
                         # Auto-save the trained model
                         model_file = "effort_expense_model_catboost.pkl"
                         processor.save_model(model_file)
+                        _scan_model_files.clear()
+                        # The saved model is now the active one; reload it on next use
+                        get_processor.clear()
                         st.info(f"Model automatically saved as {model_file}")
                         
                     except Exception as e:
@@ -1051,7 +1192,9 @@ def upload_data_tab(effort_limit: int, missing_threshold: float):
                             # Load existing model
                             model_file = "effort_expense_model_catboost.pkl"
                             if os.path.exists(model_file):
-                                processor.load_model(model_file)
+                                processor = _load_processor(
+                                    model_file, os.path.getmtime(model_file), effort_limit, missing_threshold
+                                )
                                 
                                 # Store in session state
                                 st.session_state['processor'] = processor
@@ -1066,10 +1209,9 @@ def upload_data_tab(effort_limit: int, missing_threshold: float):
                                 metrics = model_info.get('metrics', {})
                                 
                                 # Make predictions
-                                df_predicted = processor.predict_effort_expenses(df_processed)
-                                issues = processor.identify_issues(df_predicted)
-                                summary = processor.generate_summary_report(df_predicted, issues)
-                                notification_data = processor.prepare_notification_data(df_predicted, issues)
+                                df_predicted, issues, summary, notification_data = _predict_bundle(
+                                    processor, df_processed, processor.model_version
+                                )
                                 
                                 # Store in session state
                                 st.session_state['df_original'] = df
@@ -1094,7 +1236,10 @@ def upload_data_tab(effort_limit: int, missing_threshold: float):
                     with st.spinner("Making predictions..."):
                         try:
                             # Use already loaded model
-                            processor = st.session_state['processor']
+                            processor = st.session_state.get('processor')
+                            if processor is None or not processor.is_model_trained:
+                                st.error("The loaded model is no longer available. Please load or train a model again.")
+                                return
                             st.success("Using loaded model for predictions!")
                             
                             # Get model info
@@ -1102,10 +1247,9 @@ def upload_data_tab(effort_limit: int, missing_threshold: float):
                             metrics = model_info.get('metrics', {})
                             
                             # Make predictions
-                            df_predicted = processor.predict_effort_expenses(df_processed)
-                            issues = processor.identify_issues(df_predicted)
-                            summary = processor.generate_summary_report(df_predicted, issues)
-                            notification_data = processor.prepare_notification_data(df_predicted, issues)
+                            df_predicted, issues, summary, notification_data = _predict_bundle(
+                                processor, df_processed, processor.model_version
+                            )
                             
                             # Store in session state
                             st.session_state['df_original'] = df
@@ -1163,53 +1307,25 @@ def upload_data_tab(effort_limit: int, missing_threshold: float):
                         
                         # Display data preview
                         st.subheader("Prediction Preview")
-                        preview_columns = ['effortDate', 'updUserOid', 'effortExpense_original', 'effortExpense_predicted', 
-                                        'effortExpense_final', 'is_missing_effort', 'is_over_limit']
-                        available_columns = [col for col in preview_columns if col in df_predicted.columns]
+                        predicted_rows_display, df_display = _prediction_previews(df_predicted)
                         
                         # Show only rows that were actually predicted
-                        predicted_rows = df_predicted[df_predicted['needs_prediction']].copy()
-                        if len(predicted_rows) > 0:
-                            # Rename updUserOid to userid for display
-                            if 'updUserOid' in predicted_rows.columns:
-                                predicted_rows_display = predicted_rows.rename(columns={'updUserOid': 'userid'})
-                                # Update available_columns to include userid instead of updUserOid
-                                display_cols = [col if col != 'updUserOid' else 'userid' for col in available_columns]
-                            else:
-                                predicted_rows_display = predicted_rows
-                                display_cols = available_columns
-                            
+                        if len(predicted_rows_display) > 0:
                             st.write("**Rows that were predicted (missing or over-limit):**")
-                            st.dataframe(
-                                predicted_rows_display[[col for col in display_cols if col in predicted_rows_display.columns]],
-                                use_container_width=True
-                            )
+                            st.dataframe(predicted_rows_display, use_container_width=True)
                         else:
                             st.write("**No rows needed prediction - all values are correct!**")
                         
                         # Show all rows for comparison
-                        # Rename updUserOid to userid for display
-                        df_display = df_predicted.copy()
-                        if 'updUserOid' in df_display.columns:
-                            df_display = df_display.rename(columns={'updUserOid': 'userid'})
-                            display_cols = [col if col != 'updUserOid' else 'userid' for col in available_columns]
-                        else:
-                            display_cols = available_columns
-                        
                         st.write("**All rows (for comparison):**")
-                        st.dataframe(
-                            df_display[[col for col in display_cols if col in df_display.columns]].head(10),
-                            use_container_width=True
-                        )
+                        st.dataframe(df_display, use_container_width=True)
                         
                         # Feature importance
                         if 'feature_importance' in metrics and metrics['feature_importance']:
                             st.subheader("🔍 Feature Importance")
-                            importance_df = pd.DataFrame(
-                                list(metrics['feature_importance'].items()),
-                                columns=['Feature', 'Importance']
-                            ).sort_values('Importance', ascending=False)
+                            importance_df = processor.feature_importance_df
                             
+                            import plotly.express as px
                             fig = px.bar(
                                 importance_df.head(15),
                                 x='Importance',
@@ -1217,7 +1333,7 @@ def upload_data_tab(effort_limit: int, missing_threshold: float):
                                 orientation='h',
                                 title="Top 15 Most Important Features"
                             )
-                            st.plotly_chart(fig, use_container_width=True, key="feature_importance_upload")
+                            _show_chart(fig, "feature_importance_upload")
             
             else:
                 if load_existing_model:
@@ -1227,8 +1343,7 @@ def upload_data_tab(effort_limit: int, missing_threshold: float):
             
             # Show available saved models
             st.subheader("💾 Saved Models")
-            import os
-            model_files = [f for f in os.listdir('.') if f.startswith('effort_expense_model_') and f.endswith('.pkl')]
+            model_files = _saved_model_files()
             
             if model_files:
                 st.write("Available saved models:")
@@ -1245,6 +1360,7 @@ def upload_data_tab(effort_limit: int, missing_threshold: float):
     else:
         st.info("👆 Please upload a file to get started")
 
+@_fragment
 def analysis_tab():
     """Data analysis and visualization tab."""
     st.header("📊 Data Analysis")
@@ -1288,90 +1404,111 @@ def create_effort_distribution_chart(df):
     """Create effort distribution visualization."""
     st.subheader("Effort Expense Distribution")
     
+    # Both charts only read the effort column, so only it is hashed
+    effort = df[['effortExpense_final']]
+    
     # Histogram
-    fig = px.histogram(
-        df, 
+    _show_px_chart(
+        'histogram',
+        effort,
+        "effort_distribution_hist",
+        layout={'showlegend': False},
         x='effortExpense_final',
         nbins=30,
         title="Distribution of Effort Expenses",
         labels={'effortExpense_final': 'Effort Expense (hours)', 'count': 'Frequency'}
     )
-    fig.update_layout(showlegend=False)
-    st.plotly_chart(fig, use_container_width=True, key="effort_distribution_hist")
     
     # Box plot
-    fig_box = px.box(
-        df,
+    _show_px_chart(
+        'box',
+        effort,
+        "effort_distribution_box",
         y='effortExpense_final',
         title="Effort Expense Box Plot",
         labels={'effortExpense_final': 'Effort Expense (hours)'}
     )
-    st.plotly_chart(fig_box, use_container_width=True, key="effort_distribution_box")
+
+def _top_values_by_category(df: pd.DataFrame, mask, categories: list, count_name: str,
+                            n: int = 10) -> pd.DataFrame:
+    """Count the n most common values of each category column among the masked rows."""
+    columns = [c for c in categories if c in df.columns]
+    if not columns:
+        return pd.DataFrame(columns=['Category', 'Value', count_name])
+    rows = df.loc[mask, columns]
+    # Stack the columns into one long categorical frame (melt would fall back
+    # to object strings for categoricals with different levels), so the
+    # grouped count below runs on integer codes; columns keep their order
+    long = pd.DataFrame({
+        'Category': pd.Categorical.from_codes(pd.RangeIndex(len(columns)).repeat(len(rows)),
+                                              categories=columns),
+        'Value': union_categoricals([rows[c].astype('category') for c in columns], ignore_order=True)
+    })
+    counts = long.groupby('Category', observed=True)['Value'].value_counts()
+    top = counts[counts > 0].groupby(level=0, observed=True).head(n).reset_index(name=count_name)
+    return top.astype({'Category': str, 'Value': str})
+
+def _effort_days(df: pd.DataFrame) -> pd.Series:
+    """Calendar day of each effortDate as datetime64[D], computed once per processed frame."""
+    cached = st.session_state.get('_effort_days')
+    if cached is None or cached[0] is not df:
+        days = pd.Series(df['effortDate'].to_numpy(dtype='datetime64[D]'), index=df.index, name='Date')
+        cached = st.session_state['_effort_days'] = (df, days)
+    return cached[1]
 
 def create_missing_data_chart(df, issues):
     """Create missing data analysis chart."""
     st.subheader("Missing Data Analysis")
     
     # Missing data by category
-    missing_by_category = []
     categories = ['msg_JobTitle', 'msg_Community', 'taskType', 'CountryManagerForProject']
+    missing_df = _top_values_by_category(df, df['is_missing_effort'], categories, 'Missing_Count')
     
-    for category in categories:
-        if category in df.columns:
-            missing_count = df[df['is_missing_effort']][category].value_counts().head(10)
-            for cat, count in missing_count.items():
-                missing_by_category.append({'Category': category, 'Value': str(cat), 'Missing_Count': count})
-    
-    if missing_by_category:
-        missing_df = pd.DataFrame(missing_by_category)
-        fig = px.bar(
+    if not missing_df.empty:
+        _show_px_chart(
+            'bar',
             missing_df,
+            "missing_data_category",
             x='Missing_Count',
             y='Value',
             color='Category',
             title="Missing Data by Category",
             orientation='h'
         )
-        st.plotly_chart(fig, use_container_width=True, key="missing_data_category")
     
     # Missing data timeline
     if 'effortDate' in df.columns:
-        missing_timeline = df[df['is_missing_effort']].groupby(df['effortDate'].dt.date).size().reset_index()
+        missing_timeline = df[df['is_missing_effort']].groupby(_effort_days(df)).size().reset_index()
         missing_timeline.columns = ['Date', 'Missing_Count']
         
-        fig = px.line(
+        _show_px_chart(
+            'line',
             missing_timeline,
+            "missing_data_timeline",
             x='Date',
             y='Missing_Count',
             title="Missing Data Over Time"
         )
-        st.plotly_chart(fig, use_container_width=True, key="missing_data_timeline")
 
 def create_over_limit_chart(df, issues):
     """Create over-limit analysis chart."""
     st.subheader("Over-Limit Analysis")
     
     # Over-limit by category
-    over_limit_by_category = []
     categories = ['msg_JobTitle', 'msg_Community', 'taskType']
+    over_limit_df = _top_values_by_category(df, df['is_over_limit'], categories, 'Over_Limit_Count')
     
-    for category in categories:
-        if category in df.columns:
-            over_limit_count = df[df['is_over_limit']][category].value_counts().head(10)
-            for cat, count in over_limit_count.items():
-                over_limit_by_category.append({'Category': category, 'Value': str(cat), 'Over_Limit_Count': count})
-    
-    if over_limit_by_category:
-        over_limit_df = pd.DataFrame(over_limit_by_category)
-        fig = px.bar(
+    if not over_limit_df.empty:
+        _show_px_chart(
+            'bar',
             over_limit_df,
+            "over_limit_category",
             x='Over_Limit_Count',
             y='Value',
             color='Category',
             title="Over-Limit Data by Category",
             orientation='h'
         )
-        st.plotly_chart(fig, use_container_width=True, key="over_limit_category")
 
 def create_time_series_chart(df):
     """Create time series analysis chart."""
@@ -1379,27 +1516,45 @@ def create_time_series_chart(df):
     
     if 'effortDate' in df.columns:
         # Daily effort trends
-        daily_effort = df.groupby(df['effortDate'].dt.date)['effortExpense_final'].agg(['mean', 'sum', 'count']).reset_index()
+        daily_effort = df.groupby(_effort_days(df))['effortExpense_final'].agg(['mean', 'sum', 'count']).reset_index()
         daily_effort.columns = ['Date', 'Average_Effort', 'Total_Effort', 'Record_Count']
         
         # Average effort over time
-        fig1 = px.line(
+        _show_px_chart(
+            'line',
             daily_effort,
+            "time_series_avg",
             x='Date',
             y='Average_Effort',
             title="Average Effort Expense Over Time"
         )
-        st.plotly_chart(fig1, use_container_width=True, key="time_series_avg")
         
         # Total effort over time
-        fig2 = px.bar(
+        _show_px_chart(
+            'bar',
             daily_effort,
+            "time_series_total",
             x='Date',
             y='Total_Effort',
             title="Total Effort Expense Over Time"
         )
-        st.plotly_chart(fig2, use_container_width=True, key="time_series_total")
 
+def _notification_frame(notification_data: list) -> pd.DataFrame:
+    """Notification preview frame, built once per notification list and kept in session state."""
+    cached = st.session_state.get('_notification_frame')
+    if cached is None or cached[0] is not notification_data:
+        notification_df = pd.DataFrame(notification_data)
+        
+        # Add rounded absolute predicted effort column
+        # (vectorized; half-to-even like round(), integers when nothing is missing)
+        rounded_effort = notification_df['predicted_effort'].round()
+        if rounded_effort.notna().all():
+            rounded_effort = rounded_effort.astype('int64')
+        notification_df['absoluted_predicted_effort'] = rounded_effort
+        cached = st.session_state['_notification_frame'] = (notification_data, notification_df)
+    return cached[1]
+
+@_fragment
 def notifications_tab(send_emails: bool, send_teams: bool, n8n_webhook: str):
     """Notifications management tab."""
     st.header("🔔 Notification Management")
@@ -1411,6 +1566,10 @@ def notifications_tab(send_emails: bool, send_teams: bool, n8n_webhook: str):
     notification_data = st.session_state['notification_data']
     summary = st.session_state['summary']
     
+    # Create a DataFrame for display; the alert counts come from the same frame
+    notification_df = _notification_frame(notification_data) if notification_data else None
+    issue_types = notification_df['issue_type'].to_numpy() if notification_df is not None else []
+    
     # Notification summary
     col1, col2, col3 = st.columns(3)
     
@@ -1418,25 +1577,17 @@ def notifications_tab(send_emails: bool, send_teams: bool, n8n_webhook: str):
         st.metric("Total Notifications", len(notification_data))
     
     with col2:
-        missing_notifications = len([n for n in notification_data if n['issue_type'] == 'missing'])
+        missing_notifications = int((issue_types == 'missing').sum()) if len(issue_types) else 0
         st.metric("Missing Data Alerts", missing_notifications)
     
     with col3:
-        over_limit_notifications = len([n for n in notification_data if n['issue_type'] == 'over_limit'])
+        over_limit_notifications = int((issue_types == 'over_limit').sum()) if len(issue_types) else 0
         st.metric("Over-Limit Alerts", over_limit_notifications)
     
     # Notification preview
     st.subheader("📋 Notification Preview")
     
     if notification_data:
-        # Create a DataFrame for display
-        notification_df = pd.DataFrame(notification_data)
-        
-        # Add rounded absolute predicted effort column
-        notification_df['absoluted_predicted_effort'] = notification_df['predicted_effort'].apply(
-            lambda x: round(x) if pd.notna(x) else x
-        )
-        
         # Display columns
         display_cols = ['user_email', 'userid', 'project_name', 'task_name', 'effort_date', 
                        'issue_type', 'predicted_effort', 'absoluted_predicted_effort']
@@ -1470,17 +1621,28 @@ def send_notifications(notification_data: list, summary: dict, send_emails: bool
     with st.spinner("Sending notifications..."):
         try:
             # Initialize services
-            notification_service = NotificationService()
-            n8n_manager = N8NWorkflowManager(n8n_webhook)
+            notification_service = _get_notification_service()
+            n8n_manager = _get_n8n_manager(n8n_webhook)
             
             results = {
                 'emails_sent': 0,
                 'emails_failed': 0,
                 'teams_sent': 0,
                 'teams_failed': 0,
+                'emails_skipped': 0,
                 'n8n_sent': False
             }
             
+            # Start the n8n webhook in the background so it overlaps the
+            # Microsoft 365 sends
+            n8n_future = None
+            if n8n_webhook:
+                n8n_future = n8n_manager.trigger_effort_expense_workflow_async(
+                    processed_data=st.session_state['df_processed'],
+                    issues=st.session_state['issues'],
+                    notification_data=notification_data
+                )
+            
             # Send via Microsoft 365
             if send_emails or send_teams:
                 microsoft_results = notification_service.send_effort_expense_notifications(
@@ -1490,14 +1652,9 @@ def send_notifications(notification_data: list, summary: dict, send_emails: bool
                 )
                 results.update(microsoft_results)
             
-            # Send via n8n
-            if n8n_webhook:
-                n8n_success = n8n_manager.trigger_effort_expense_workflow(
-                    processed_data=st.session_state['df_processed'].to_dict('records'),
-                    issues=st.session_state['issues'],
-                    notification_data=notification_data
-                )
-                results['n8n_sent'] = n8n_success
+            # Collect the n8n result
+            if n8n_future is not None:
+                results['n8n_sent'] = n8n_future.result()
             
             # Display results
             if results['emails_sent'] > 0 or results['teams_sent'] > 0 or results['n8n_sent']:
@@ -1520,6 +1677,7 @@ def test_notifications(notification_data: list):
     
     st.success("✅ Test completed! Check the notification preview above.")
 
+@_fragment
 def model_management_tab():
     """Model management and evaluation tab."""
     st.header("Model Management")
@@ -1576,18 +1734,23 @@ def model_management_tab():
         if st.button("💾 Save Model"):
             try:
                 processor.save_model()
+                _scan_model_files.clear()
+                get_processor.clear()
                 st.success("✅ Model saved successfully!")
             except Exception as e:
                 st.error(f"❌ Error saving model: {str(e)}")
     
     with col2:
+        force_cv = st.checkbox("Force recompute", key="force_cv",
+                               help="Retrain the folds even if this model was already cross-validated")
         if st.button("📊 Cross-Validate Model"):
             try:
                 with st.spinner("Performing cross-validation..."):
-                    cv_results = processor.cross_validate_model(st.session_state['df_processed'])
+                    cv_results = processor.cross_validate_model(st.session_state['df_processed'], force=force_cv)
                 
                 st.success("Cross-validation completed successfully!")
-                st.info("Model validation shows good performance across different data folds")
+                st.info(f"CV RMSE: {cv_results['cv_rmse_mean']:.2f} ± {cv_results['cv_rmse_std']:.2f} hours "
+                        f"across {len(cv_results['cv_scores'])} folds")
                 
             except Exception as e:
                 st.error(f"❌ Error in cross-validation: {str(e)}")
@@ -1602,23 +1765,21 @@ def model_management_tab():
         
         importance_data = st.session_state['model_metrics']['feature_importance']
         if importance_data:
-            importance_df = pd.DataFrame(
-                list(importance_data.items()),
-                columns=['Feature', 'Importance']
-            ).sort_values('Importance', ascending=False)
+            importance_df = processor.feature_importance_df
             
             # Display top features
             st.dataframe(importance_df.head(20), use_container_width=True)
             
             # Feature importance chart
-            fig = px.bar(
+            _show_px_chart(
+                'bar',
                 importance_df.head(15),
+                "feature_importance_management",
                 x='Importance',
                 y='Feature',
                 orientation='h',
                 title="Top 15 Most Important Features"
             )
-            st.plotly_chart(fig, use_container_width=True, key="feature_importance_management")
     
     # Model comparison
     st.subheader("⚖️ Model Comparison")
@@ -1627,11 +1788,11 @@ def model_management_tab():
         try:
             with st.spinner("Training and comparing models..."):
                 # Train CatBoost
-                processor_catboost = DataProcessor(
-                    effort_limit=st.session_state['processor'].effort_limit,
-                    missing_threshold=st.session_state['processor'].missing_threshold
+                processor_catboost, metrics_catboost = _train_comparison_model(
+                    st.session_state['df_processed'],
+                    st.session_state['processor'].effort_limit,
+                    st.session_state['processor'].missing_threshold
                 )
-                metrics_catboost = processor_catboost.train_model(st.session_state['df_processed'], hyperparameter_tuning=False)
                 
                 # Show CatBoost results
                 st.success("CatBoost model trained successfully!")
@@ -1639,11 +1800,9 @@ def model_management_tab():
                 # Feature importance
                 if 'feature_importance' in metrics_catboost and metrics_catboost['feature_importance']:
                     st.subheader("🔍 Feature Importance")
-                    importance_df = pd.DataFrame(
-                        list(metrics_catboost['feature_importance'].items()),
-                        columns=['Feature', 'Importance']
-                    ).sort_values('Importance', ascending=True)
+                    importance_df = processor_catboost.feature_importance_df
                     
+                    import plotly.express as px
                     fig = px.bar(
                         importance_df.head(15),
                         x='Importance',
@@ -1651,12 +1810,13 @@ def model_management_tab():
                         orientation='h',
                         title="Top 15 Most Important Features"
                     )
-                    st.plotly_chart(fig, use_container_width=True, key="feature_importance_comparison")
+                    _show_chart(fig, "feature_importance_comparison")
                 
                 
         except Exception as e:
             st.error(f"❌ Error comparing models: {str(e)}")
 
+@_fragment
 def reports_tab():
     """Reports and export tab."""
     st.header("📈 Reports and Export")
@@ -1680,13 +1840,273 @@ def reports_tab():
     with col2:
         export_format = st.selectbox(
             "Export Format",
-            ["Excel", "CSV", "JSON"]
+            ["Excel", "CSV", "JSON", "JSON Lines"] + (["Parquet"] if _HAS_PYARROW else [])
         )
     
     # Generate report
     if st.button("📊 Generate Report"):
         generate_report(report_type, export_format, df, summary)
 
+# Minimal package parts for a one-sheet .xlsx; styles are 0 = default,
+# 1 = bold header, 2 = date-time
+_XLSX_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_XLSX_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        f'<Relationship Id="rId1" Type="{_XLSX_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<workbook xmlns="{_XLSX_MAIN_NS}" xmlns:r="{_XLSX_REL_NS}">'
+        '<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets></workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        f'<Relationship Id="rId1" Type="{_XLSX_REL_NS}/worksheet" Target="worksheets/sheet1.xml"/>'
+        f'<Relationship Id="rId2" Type="{_XLSX_REL_NS}/styles" Target="styles.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/styles.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<styleSheet xmlns="{_XLSX_MAIN_NS}">'
+        '<numFmts count="1"><numFmt numFmtId="164" formatCode="yyyy-mm-dd hh:mm:ss"/></numFmts>'
+        '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+        '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="3"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+        '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'
+    ),
+}
+_XLSX_MAX_ROWS = 1048576
+_XLSX_MAX_COLS = 16384
+_XLSX_CHUNK_ROWS = 10000
+_XLSX_EMPTY_CELL = '<c/>'
+_XLSX_EPOCH = pd.Timestamp('1899-12-30')
+# Characters XML 1.0 can't hold; dropped from cell text
+_XML_ILLEGAL_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+def _xlsx_text_cell(text: str, style: int = 0) -> str:
+    """Inline-string cell for a piece of text."""
+    text = _XML_ILLEGAL_CHARS.sub('', text).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    style_attr = f' s="{style}"' if style else ''
+    return f'<c t="inlineStr"{style_attr}><is><t xml:space="preserve">{text}</t></is></c>'
+
+def _xlsx_number_cell(value: float) -> str:
+    """Number cell; NaN and infinities are left empty."""
+    return f'<c><v>{value!r}</v></c>' if math.isfinite(value) else _XLSX_EMPTY_CELL
+
+def _xlsx_value_cell(value) -> str:
+    """Cell for any single value, typed like pandas' to_excel would write it."""
+    if value is None or value is pd.NA or value is pd.NaT:
+        return _XLSX_EMPTY_CELL
+    if isinstance(value, (bool, np.bool_)):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, np.integer)):
+        return f'<c><v>{int(value)}</v></c>'
+    if isinstance(value, (float, np.floating)):
+        return _xlsx_number_cell(float(value))
+    if isinstance(value, (datetime, date, np.datetime64)):
+        serial = (pd.Timestamp(value) - _XLSX_EPOCH) / pd.Timedelta(days=1)
+        return f'<c s="2"><v>{serial!r}</v></c>'
+    return _xlsx_text_cell(str(value))
+
+def _xlsx_column_cells(column: pd.Series) -> list:
+    """Cell XML for every value of a column, converted by dtype where possible."""
+    dtype = column.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        # One cell per category, picked by code; code -1 (missing) takes the empty cell
+        cells = np.array([_xlsx_value_cell(value) for value in dtype.categories] + [_XLSX_EMPTY_CELL],
+                         dtype=object)
+        return cells[column.cat.codes.to_numpy()].tolist()
+    # Nullable (extension) bool/int columns can hold NA, so only plain numpy ones take these paths
+    if isinstance(dtype, np.dtype) and dtype.kind == 'b':
+        return np.where(column.to_numpy(), '<c t="b"><v>1</v></c>', '<c t="b"><v>0</v></c>').tolist()
+    if isinstance(dtype, np.dtype) and dtype.kind in 'iu':
+        return [f'<c><v>{value}</v></c>' for value in column.to_numpy().tolist()]
+    if dtype.kind == 'f':
+        # NaN/inf are found in one vectorised pass rather than checked per cell
+        values = column.to_numpy(dtype='float64', na_value=np.nan)
+        return [f'<c><v>{value!r}</v></c>' if finite else _XLSX_EMPTY_CELL
+                for value, finite in zip(values.tolist(), np.isfinite(values).tolist())]
+    if dtype.kind == 'M' and getattr(dtype, 'tz', None) is None:
+        serials = ((column - _XLSX_EPOCH) / pd.Timedelta(days=1)).to_numpy()
+        return [f'<c s="2"><v>{value!r}</v></c>' if value == value else _XLSX_EMPTY_CELL
+                for value in serials.tolist()]
+    return [_xlsx_value_cell(value) for value in column.astype(object).tolist()]
+
+def _fast_xlsx_bytes(df: pd.DataFrame) -> bytes:
+    """Write one DataFrame as a single-sheet .xlsx by generating the sheet XML directly.
+
+    Cells are converted a column (and chunk of rows) at a time by dtype and
+    streamed into the zip, skipping per-cell objects entirely. Headers are
+    bold and date-times use pandas' default format, as with to_excel.
+    """
+    if len(df) + 1 > _XLSX_MAX_ROWS or len(df.columns) > _XLSX_MAX_COLS:
+        raise ValueError(f"This sheet is too large! Your sheet size is: {len(df) + 1}, {len(df.columns)} "
+                         f"Max sheet size is: {_XLSX_MAX_ROWS}, {_XLSX_MAX_COLS}")
+    
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_PARTS.items():
+            archive.writestr(name, content)
+        with archive.open('xl/worksheets/sheet1.xml', 'w') as sheet:
+            header = ''.join(_xlsx_text_cell(str(column), style=1) for column in df.columns)
+            sheet.write(('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                         f'<worksheet xmlns="{_XLSX_MAIN_NS}"><sheetData>'
+                         f'<row r="1">{header}</row>').encode('utf-8'))
+            for start in range(0, len(df), _XLSX_CHUNK_ROWS):
+                chunk = df.iloc[start:start + _XLSX_CHUNK_ROWS]
+                columns = [_xlsx_column_cells(chunk.iloc[:, i]) for i in range(chunk.shape[1])]
+                sheet.write(''.join(
+                    f'<row r="{row_number}">{"".join(cells)}</row>'
+                    for row_number, cells in enumerate(zip(*columns), start + 2)
+                ).encode('utf-8'))
+            sheet.write(b'</sheetData></worksheet>')
+    return output.getvalue()
+
+def _sheet_rows(data: pd.DataFrame):
+    """Yield a frame's rows as lists of Python values, with None for missing values."""
+    values = data.astype(object).where(data.notna(), None).to_numpy()
+    yield from values.tolist()
+
+def _excel_report_bytes(sheets: dict) -> bytes:
+    """Write {sheet name: DataFrame} to an .xlsx file in memory.
+
+    Rows are streamed out one at a time, with bold headers like pandas
+    writes them: through xlsxwriter in constant_memory mode when it is
+    installed, otherwise an openpyxl write-only workbook. pandas'
+    ExcelWriter can't be used for either, as it writes cells column by
+    column, which neither mode supports.
+    """
+    output = io.BytesIO()
+    if _HAS_XLSXWRITER:
+        import xlsxwriter
+        
+        # Cell text is written as-is, never turned into formulas or links
+        workbook = xlsxwriter.Workbook(output, {
+            'constant_memory': True,
+            'strings_to_numbers': False,
+            'strings_to_formulas': False,
+            'strings_to_urls': False,
+            'default_date_format': 'yyyy-mm-dd hh:mm:ss'
+        })
+        header_format = workbook.add_format({'bold': True})
+        for sheet_name, data in sheets.items():
+            sheet = workbook.add_worksheet(sheet_name)
+            sheet.write_row(0, 0, [str(column) for column in data.columns], header_format)
+            for row_number, row in enumerate(_sheet_rows(data), 1):
+                sheet.write_row(row_number, 0, row)
+        workbook.close()
+        return output.getvalue()
+    
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+    
+    workbook = Workbook(write_only=True)
+    header_font = Font(bold=True)
+    for sheet_name, data in sheets.items():
+        sheet = workbook.create_sheet(title=sheet_name)
+        header = []
+        for column in data.columns:
+            cell = WriteOnlyCell(sheet, value=str(column))
+            cell.font = header_font
+            header.append(cell)
+        sheet.append(header)
+        for row in _sheet_rows(data):
+            sheet.append(row)
+    
+    workbook.save(output)
+    return output.getvalue()
+
+def _csv_report_bytes(df: pd.DataFrame) -> bytes:
+    """Write a frame as CSV with pandas' to_csv.
+
+    pyarrow's CSV writer is not used even when installed: it quotes every
+    string and formats bools, whole floats and date-only values differently,
+    so the file would depend on an optional import.
+    """
+    return df.to_csv(index=False).encode('utf-8')
+
+def _report_json_bytes(report_data: dict) -> bytes:
+    """Serialise a dict report (e.g. the summary) as indented JSON, with orjson when it is installed."""
+    report_data = {name: table.to_dict('records') if isinstance(table, pd.DataFrame) else table
+                   for name, table in report_data.items()}
+    return json_dumps(report_data, indent=True)
+
+_JSONL_CHUNK_ROWS = 10000
+
+def _excel_export_bytes(report_data) -> bytes:
+    """Excel export: one sheet per table of a dict report, or a single sheet."""
+    # Single frames (raw data, detailed analysis, notifications) skip
+    # the workbook library and have their sheet XML generated directly
+    if isinstance(report_data, dict):
+        return _excel_report_bytes(report_data)
+    return _fast_xlsx_bytes(report_data)
+
+def _json_export_bytes(report_data) -> bytes:
+    """JSON export: an indented records array, or an object of them for a dict report."""
+    if isinstance(report_data, dict):
+        return _report_json_bytes(report_data)
+    return report_data.to_json(orient='records', indent=2).encode('utf-8')
+
+def _jsonl_export_bytes(report_data: pd.DataFrame) -> bytes:
+    """JSON Lines export, encoded a chunk of rows at a time so only one chunk's text is held alongside the output."""
+    return b''.join(
+        report_data.iloc[start:start + _JSONL_CHUNK_ROWS]
+        .to_json(orient='records', lines=True, date_format='iso').encode('utf-8')
+        for start in range(0, len(report_data), _JSONL_CHUNK_ROWS)
+    )
+
+def _parquet_export_bytes(report_data: pd.DataFrame) -> bytes:
+    """Parquet export through pyarrow, zstd-compressed."""
+    output = io.BytesIO()
+    report_data.to_parquet(output, engine='pyarrow', compression='zstd', index=False)
+    return output.getvalue()
+
+# File extension, MIME type and writer of each export format
+_EXPORT_FORMATS = {
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", _excel_export_bytes),
+    "CSV": ("csv", "text/csv", _csv_report_bytes),
+    "JSON": ("json", "application/json", _json_export_bytes),
+    "JSON Lines": ("jsonl", "application/x-ndjson", _jsonl_export_bytes),
+    "Parquet": ("parquet", "application/vnd.apache.parquet", _parquet_export_bytes)
+}
+
+# Export formats that hold one table, so can't take the two-table summary report
+_TABLE_ONLY_FORMATS = ("CSV", "JSON Lines", "Parquet")
+
+# Serialised reports are cached on their contents and format, so reruns
+# and repeat downloads of an unchanged report skip the export
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs={pd.DataFrame: _hash_frame})
+def _report_bytes(export_format: str, report_data) -> bytes:
+    """Serialise a report (a frame, or a dict of tables) in the chosen export format."""
+    _, _, write_report = _EXPORT_FORMATS[export_format]
+    return write_report(report_data)
+
 def generate_report(report_type: str, export_format: str, df: pd.DataFrame, summary: dict):
     """Generate and download report."""
     
@@ -1700,60 +2120,42 @@ def generate_report(report_type: str, export_format: str, df: pd.DataFrame, summ
         else:  # Raw Data Export
             report_data = df
         
-        # Export based on format
-        if export_format == "Excel":
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                if isinstance(report_data, dict):
-                    for sheet_name, data in report_data.items():
-                        pd.DataFrame(data).to_excel(writer, sheet_name=sheet_name, index=False)
-                else:
-                    report_data.to_excel(writer, index=False)
-            output.seek(0)
-            st.download_button(
-                label="📥 Download Excel Report",
-                data=output.getvalue(),
-                file_name=f"effort_expense_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
-        
-        elif export_format == "CSV":
-            csv_data = report_data.to_csv(index=False)
-            st.download_button(
-                label="📥 Download CSV Report",
-                data=csv_data,
-                file_name=f"effort_expense_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv"
-            )
-        
-        elif export_format == "JSON":
-            json_data = report_data.to_json(orient='records', indent=2)
-            st.download_button(
-                label="📥 Download JSON Report",
-                data=json_data,
-                file_name=f"effort_expense_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                mime="application/json"
-            )
+        # Export based on format; built here, inside the try, so export
+        # errors show on the page (repeat exports come from the cache)
+        if export_format in _TABLE_ONLY_FORMATS and isinstance(report_data, dict):
+            raise ValueError(f"{export_format} export needs a single table; choose Excel or JSON for this report")
+        report_bytes = _report_bytes(export_format, report_data)
+        extension, mime, _ = _EXPORT_FORMATS[export_format]
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        st.download_button(
+            label=f"📥 Download {export_format} Report",
+            data=report_bytes,
+            file_name=f"effort_expense_report_{timestamp}.{extension}",
+            mime=mime
+        )
         
         st.success("✅ Report generated successfully!")
         
     except Exception as e:
+        # The traceback goes to the log; the page only shows the message
+        logger.exception(f"Error generating {report_type} ({export_format})")
         st.error(f"❌ Error generating report: {str(e)}")
-        st.exception(e)
 
 def create_summary_report(summary: dict) -> dict:
     """Create summary report data."""
-    return {
-        "Summary": [summary],
-        "Metrics": [
-            {"Metric": "Total Rows", "Value": summary['total_rows']},
-            {"Metric": "Missing Effort Count", "Value": summary['missing_effort_count']},
-            {"Metric": "Over Limit Count", "Value": summary['over_limit_count']},
-            {"Metric": "Notification Count", "Value": summary['notification_count']},
-            {"Metric": "Missing Percentage", "Value": f"{summary['missing_percentage']:.2f}%"},
-            {"Metric": "Over Limit Percentage", "Value": f"{summary['over_limit_percentage']:.2f}%"}
-        ]
-    }
+    metrics = pd.DataFrame({
+        "Metric": ["Total Rows", "Missing Effort Count", "Over Limit Count", "Notification Count",
+                   "Missing Percentage", "Over Limit Percentage"],
+        "Value": np.array([
+            summary['total_rows'],
+            summary['missing_effort_count'],
+            summary['over_limit_count'],
+            summary['notification_count'],
+            f"{summary['missing_percentage']:.2f}%",
+            f"{summary['over_limit_percentage']:.2f}%"
+        ], dtype=object)
+    })
+    return {"Summary": pd.DataFrame.from_records([summary]), "Metrics": metrics}
 
 def create_detailed_analysis_report(df: pd.DataFrame) -> pd.DataFrame:
     """Create detailed analysis report."""
@@ -1762,7 +2164,14 @@ def create_detailed_analysis_report(df: pd.DataFrame) -> pd.DataFrame:
               'msg_JobTitle', 'msg_Community', 'taskType']
     # Only include columns that exist in the dataframe
     available_cols = [col for col in columns if col in df.columns]
-    df_report = df[available_cols].copy()
+    # Columns are only ever replaced below, never written in place, so a
+    # shallow copy is enough to leave the processed frame untouched
+    df_report = df[available_cols].copy(deep=False)
+    # Low-cardinality labels go out as categoricals, so the xlsx writer
+    # renders each distinct value once; preprocessing usually already has
+    for col in ['msg_JobTitle', 'msg_Community', 'taskType']:
+        if col in df_report.columns and not isinstance(df_report[col].dtype, pd.CategoricalDtype):
+            df_report[col] = df_report[col].astype('category')
     # Rename updUserOid to userid for display
     if 'updUserOid' in df_report.columns:
         df_report = df_report.rename(columns={'updUserOid': 'userid'})